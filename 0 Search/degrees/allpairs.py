@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import csv
+import multiprocessing
+import os
+import sys
+
+from snapshot import load_graph, map_snapshot
+
+# Graph of each worker process. Workers memory-map the same snapshot
+# file, so the adjacency pages are shared read-only through the OS
+# page cache instead of being copied into every process.
+_graph = None
+
+
+def _init_worker(directory):
+    global _graph
+    _graph = map_snapshot(directory)
+
+
+def _distances(source):
+    distances, _, _ = _graph.single_source(source)
+    return source, distances
+
+
+def distance_tables(directory, sources, processes=None):
+    """
+    Yields (source, distances) for every source person_id, where
+    distances is an array indexed by person holding the degrees of
+    separation from source, or -1 if not connected.
+
+    Sources are spread over a pool of processes when there is more
+    than one of them.
+    """
+    global _graph
+    graph = load_graph(directory)
+    processes = processes or os.cpu_count() or 1
+
+    if processes == 1 or len(sources) == 1:
+        _graph = graph
+        for source in sources:
+            yield _distances(source)
+        return
+
+    chunksize = max(1, len(sources) // (processes * 4))
+    with multiprocessing.Pool(processes, _init_worker, (directory,)) as pool:
+        yield from pool.imap(_distances, sources, chunksize)
+
+
+def write_table(filename, graph, tables):
+    """
+    Writes one source_id,target_id,degrees row per connected pair.
+    """
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["source_id", "target_id", "degrees"])
+        for source, distances in tables:
+            for person, distance in enumerate(distances):
+                if distance != -1:
+                    writer.writerow([source, graph.person_ids[person], distance])
+
+
+def main():
+    if len(sys.argv) < 3:
+        sys.exit("Usage: python allpairs.py directory output.csv [name ...]")
+    directory = sys.argv[1]
+    filename = sys.argv[2]
+
+    print("Loading data...")
+    graph = load_graph(directory)
+    print("Data loaded.")
+
+    # With no names given, compute every person against everyone.
+    if len(sys.argv) == 3:
+        sources = list(graph.person_ids)
+    else:
+        sources = []
+        for name in sys.argv[3:]:
+            indexes = graph.names.get(name.lower(), [])
+            if len(indexes) == 0:
+                sys.exit(f"Person not found: {name}")
+            sources.extend(graph.person_ids[index] for index in indexes)
+
+    write_table(filename, graph, distance_tables(directory, sources))
+    print(f"Wrote distances from {len(sources)} people to {filename}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+import csv
+import json
+import sys
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from snapshot import load_graph
+
+USAGE = ("Usage: python batch.py directory queries.csv\n"
+         "       python batch.py directory --serve [port]")
+
+
+class QueryStats():
+    """
+    Collects per-query latencies and reports throughput and percentiles.
+
+    Percentiles cover only the latest window queries, so memory and the
+    cost of a /stats call stay fixed however long the server runs.
+    Throughput is queries per second spent answering them, so time the
+    server sits idle between requests does not count against it.
+    """
+    def __init__(self, window=10000):
+        self.latencies = deque(maxlen=window)
+        self.queries = 0
+        self.busy = 0.0
+        self.started = time.perf_counter()
+
+    def record(self, seconds):
+        self.latencies.append(seconds)
+        self.queries += 1
+        self.busy += seconds
+
+    def percentile(self, p):
+        """
+        Returns the nearest-rank p-th percentile latency in milliseconds
+        over the window.
+        """
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        rank = max(1, -(-len(ordered) * p // 100))
+        return round(ordered[int(rank) - 1] * 1000, 3)
+
+    def summary(self):
+        return {
+            "queries": self.queries,
+            "seconds": round(time.perf_counter() - self.started, 3),
+            "busy_seconds": round(self.busy, 3),
+            "queries_per_second": round(self.queries / self.busy, 1) if self.busy else None,
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+        }
+
+
+class QueryEngine():
+    """
+    Answers degrees queries against a graph loaded once.
+    """
+    def __init__(self, graph):
+        self.graph = graph
+        self.stats = QueryStats()
+
+    def resolve(self, name):
+        """
+        Returns (person_id, error) for a name or IMDB id. Ambiguous names
+        cannot be asked about interactively, so they are reported with
+        their candidate ids instead.
+        """
+        indexes = self.graph.names.get(name.lower(), [])
+        if len(indexes) == 1:
+            return self.graph.person_ids[indexes[0]], None
+        if len(indexes) > 1:
+            ids = [self.graph.person_ids[index] for index in indexes]
+            return None, f"ambiguous name, candidates: {', '.join(ids)}"
+        if name in self.graph.person_index:
+            return name, None
+        return None, "person not found"
+
+    def query(self, source_name, target_name):
+        """
+        Returns a JSON-serializable record answering one query.
+        """
+        start = time.perf_counter()
+        record = {"source": source_name, "target": target_name}
+        source, error = self.resolve(source_name)
+        if error is None:
+            target, error = self.resolve(target_name)
+        if error is not None:
+            record["error"] = error
+        else:
+            path = self.graph.shortest_path(source, target)
+            record["degrees"] = None if path is None else len(path)
+            record["path"] = None if path is None else [self.step(step) for step in path]
+        self.stats.record(time.perf_counter() - start)
+        return record
+
+    def step(self, step):
+        movie_id, person_id = step
+        graph = self.graph
+        return {
+            "movie_id": movie_id,
+            "movie": graph.movie_titles[graph.movie_index[movie_id]],
+            "person_id": person_id,
+            "person": graph.person_names[graph.person_index[person_id]],
+        }
+
+
+def run_file(engine, filename):
+    """
+    Answers every name pair in a CSV file (or stdin for "-"),
+    writing one JSON line per query to stdout.
+    """
+    f = sys.stdin if filename == "-" else open(filename, encoding="utf-8")
+    try:
+        for row in csv.reader(f):
+            if len(row) != 2:
+                continue
+            record = engine.query(row[0].strip(), row[1].strip())
+            print(json.dumps(record))
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def make_handler(engine):
+
+    class Handler(BaseHTTPRequestHandler):
+        """
+        GET /query?source=NAME&target=NAME returns one JSON record,
+        POST /query takes a CSV body of name pairs and returns JSON lines,
+        GET /stats returns the throughput summary.
+        """
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/stats":
+                return self.reply(json.dumps(engine.stats.summary()))
+            if url.path != "/query":
+                return self.send_error(404)
+            params = parse_qs(url.query)
+            if "source" not in params or "target" not in params:
+                return self.send_error(400, "source and target are required")
+            self.reply(json.dumps(engine.query(params["source"][0], params["target"][0])))
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/query":
+                return self.send_error(404)
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+            except ValueError:
+                return self.send_error(400, "Content-Length must be an integer")
+            body = self.rfile.read(length).decode("utf-8")
+            lines = []
+            for row in csv.reader(body.splitlines()):
+                if len(row) == 2:
+                    lines.append(json.dumps(engine.query(row[0].strip(), row[1].strip())))
+            self.reply("".join(line + "\n" for line in lines), "application/x-ndjson")
+
+        def reply(self, body, content_type="application/json"):
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    if len(sys.argv) < 3 or len(sys.argv) > 4:
+        sys.exit(USAGE)
+    directory = sys.argv[1]
+
+    print("Loading data...", file=sys.stderr)
+    engine = QueryEngine(load_graph(directory))
+    print("Data loaded.", file=sys.stderr)
+
+    if sys.argv[2] == "--serve":
+        port = int(sys.argv[3]) if len(sys.argv) == 4 else 8050
+        server = HTTPServer(("127.0.0.1", port), make_handler(engine))
+        print(f"Serving on http://127.0.0.1:{port}/query", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    elif len(sys.argv) == 3:
+        run_file(engine, sys.argv[2])
+    else:
+        sys.exit(USAGE)
+
+    print(json.dumps(engine.stats.summary()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+import contextlib
+import io
+import random
+import sys
+import time
+
+import degrees3
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python benchmark.py [directory] [pairs]")
+    directory = sys.argv[1] if len(sys.argv) >= 2 else "large"
+    pairs = int(sys.argv[2]) if len(sys.argv) == 3 else 20
+
+    print("Loading data...")
+    degrees3.load_data(directory)
+    print("Data loaded.")
+
+    random.seed(0)
+    person_ids = list(degrees3.people)
+    queries = [(random.choice(person_ids), random.choice(person_ids))
+               for _ in range(pairs)]
+
+    searches = [
+        ("shortest_path", degrees3.shortest_path),
+        ("bidirectional", degrees3.bidirectional_shortest_path),
+    ]
+    totals = {}
+    for name, search in searches:
+        totals[name] = {"expanded": 0, "seconds": 0.0, "lengths": []}
+        for source, target in queries:
+            expanded, seconds, path = run(search, source, target)
+            totals[name]["expanded"] += expanded
+            totals[name]["seconds"] += seconds
+            totals[name]["lengths"].append(None if path is None else len(path))
+
+    print(f"{len(queries)} random source/target pairs")
+    print(f"{'search':<16}{'expanded':>12}{'seconds':>12}")
+    for name, _ in searches:
+        total = totals[name]
+        print(f"{name:<16}{total['expanded']:>12}{total['seconds']:>12.4f}")
+
+    counts = degrees3.neighbor_counts
+    print(f"Neighbor pairs built lazily: {counts['yielded']}, "
+          f"avoided compared with neighbors_for_person: {counts['avoided']}")
+
+    for i, (source, target) in enumerate(queries):
+        lengths = [totals[name]["lengths"][i] for name, _ in searches]
+        if len(set(lengths)) != 1:
+            print(f"Mismatch for {source} -> {target}: {lengths}")
+
+
+def run(search, source, target):
+    """
+    Runs one search and returns the number of people expanded,
+    the wall-clock time in seconds and the path found.
+    """
+    expanded = 0
+    lazy_neighbors = degrees3.lazy_neighbors
+
+    def counting_lazy_neighbors(person_id, used_movies):
+        nonlocal expanded
+        expanded += 1
+        return lazy_neighbors(person_id, used_movies, degrees3.neighbor_counts)
+
+    # Searches look up lazy_neighbors as a module global,
+    # so counting can be swapped in without touching them.
+    degrees3.lazy_neighbors = counting_lazy_neighbors
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            path = search(source, target)
+            seconds = time.perf_counter() - start
+    finally:
+        degrees3.lazy_neighbors = lazy_neighbors
+    return expanded, seconds, path
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import contextlib
+import io
+import random
+import resource
+import subprocess
+import sys
+import time
+
+LOADERS = ["dicts", "csr", "snapshot"]
+
+
+def main():
+    if len(sys.argv) >= 2 and sys.argv[1] == "--loader":
+        return measure(*sys.argv[2:])
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python benchmark_csr.py [directory] [pairs]")
+    directory = sys.argv[1] if len(sys.argv) >= 2 else "large"
+    pairs = sys.argv[2] if len(sys.argv) == 3 else "100"
+
+    # Build the snapshot up front so its timing shows a warm start.
+    import snapshot
+    snapshot.load_graph(directory)
+
+    # Each loader runs in its own process so peak RSS is not shared.
+    print(f"{'loader':<10}{'search':<16}{'load s':>10}{'peak RSS MB':>14}{'query ms':>12}")
+    for loader in LOADERS:
+        output = subprocess.run(
+            [sys.executable, __file__, "--loader", loader, directory, pairs],
+            capture_output=True, text=True, check=True
+        ).stdout
+        for line in output.splitlines():
+            print(line)
+
+
+def measure(loader, directory, pairs):
+    """
+    Loads the dataset with one loader, times random queries
+    and prints one result line per search.
+    """
+    start = time.perf_counter()
+    if loader == "dicts":
+        import degrees3
+        degrees3.load_data(directory)
+        person_ids = list(degrees3.people)
+        searches = [
+            ("shortest_path", degrees3.shortest_path),
+            ("bidirectional", degrees3.bidirectional_shortest_path),
+        ]
+    elif loader == "csr":
+        import csrgraph
+        graph = csrgraph.load_csr(directory)
+        person_ids = graph.person_ids
+        searches = [("shortest_path", graph.shortest_path)]
+    else:
+        import snapshot
+        graph = snapshot.load_graph(directory)
+        person_ids = graph.person_ids
+        searches = [("shortest_path", graph.shortest_path)]
+    load_seconds = time.perf_counter() - start
+
+    random.seed(0)
+    queries = [(random.choice(person_ids), random.choice(person_ids))
+               for _ in range(int(pairs))]
+
+    for name, search in searches:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for source, target in queries:
+                search(source, target)
+        query_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        # ru_maxrss is in kilobytes on Linux
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"{loader:<10}{name:<16}{load_seconds:>10.3f}{peak_mb:>14.1f}{query_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import pickle
+import random
+import sys
+import time
+
+import degrees3
+
+
+def main():
+    if len(sys.argv) > 4:
+        sys.exit("Usage: python benchmark_landmarks.py [directory] [landmarks] [pairs]")
+    directory = sys.argv[1] if len(sys.argv) >= 2 else "large"
+    count = int(sys.argv[2]) if len(sys.argv) >= 3 else 16
+    pairs = int(sys.argv[3]) if len(sys.argv) == 4 else 100
+
+    print("Loading data...")
+    degrees3.load_data(directory)
+    print("Data loaded.")
+
+    start = time.perf_counter()
+    degrees3.build_landmark_index(count)
+    build_seconds = time.perf_counter() - start
+    size = len(pickle.dumps((degrees3.landmarks, degrees3.landmark_distances),
+                            pickle.HIGHEST_PROTOCOL))
+    print(f"Index of {len(degrees3.landmarks)} landmarks built in "
+          f"{build_seconds:.3f}s, {size / 1024:.1f} KiB")
+
+    random.seed(0)
+    person_ids = list(degrees3.people)
+    queries = [(random.choice(person_ids), random.choice(person_ids))
+               for _ in range(pairs)]
+
+    direct = sum(degrees3.degrees_from_landmarks(source, target) != -1
+                 for source, target in queries)
+    print(f"{direct} of {len(queries)} queries answered from the bounds alone")
+
+    timings = {}
+    searches = [
+        ("bidirectional", degrees3.bidirectional_shortest_path),
+        ("landmark", degrees3.landmark_shortest_path),
+        ("landmark+prune", lambda source, target: degrees3.landmark_shortest_path(
+            source, target, prune=True)),
+    ]
+    for name, search in searches:
+        start = time.perf_counter()
+        for source, target in queries:
+            search(source, target)
+        timings[name] = (time.perf_counter() - start) * 1000 / len(queries)
+        print(f"{name:<16}{timings[name]:>10.3f} ms/query")
+    for name in ["landmark", "landmark+prune"]:
+        if timings[name]:
+            print(f"Speedup of {name}: {timings['bidirectional'] / timings[name]:.2f}x")
+
+if __name__ == "__main__":
+    main()
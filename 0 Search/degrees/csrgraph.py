@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+import csv
+import sys
+from array import array
+from collections import deque
+
+
+class CSRGraph():
+    """
+    Compact person-movie graph.
+
+    People and movies are numbered 0..n-1 in the order they appear in
+    people.csv and movies.csv. The bipartite star relation is kept twice
+    in compressed sparse row (CSR) form: the movies of person p are
+    person_movies[person_offsets[p]:person_offsets[p + 1]], and the stars
+    of movie m are movie_people[movie_offsets[m]:movie_offsets[m + 1]].
+    """
+    def __init__(self):
+        # Dense index -> IMDB id, and IMDB id -> dense index
+        self.person_ids = []
+        self.person_index = {}
+        self.movie_ids = []
+        self.movie_index = {}
+
+        # Dense index -> name, birth / title, year
+        self.person_names = []
+        self.person_births = []
+        self.movie_titles = []
+        self.movie_years = []
+
+        # Maps lowercase names to a list of person indexes
+        self.names = {}
+
+        # CSR adjacency
+        self.person_offsets = array("i", [0])
+        self.person_movies = array("i")
+        self.movie_offsets = array("i", [0])
+        self.movie_people = array("i")
+
+    def add_person(self, person_id, name, birth):
+        index = len(self.person_ids)
+        self.person_ids.append(person_id)
+        self.person_index[person_id] = index
+        self.person_names.append(name)
+        # Birth years repeat a lot, so share one string per year
+        self.person_births.append(sys.intern(birth))
+        self.names.setdefault(name.lower(), []).append(index)
+        return index
+
+    def add_movie(self, movie_id, title, year):
+        index = len(self.movie_ids)
+        self.movie_ids.append(movie_id)
+        self.movie_index[movie_id] = index
+        self.movie_titles.append(title)
+        self.movie_years.append(sys.intern(year))
+        return index
+
+    def build_adjacency(self, star_people, star_movies):
+        """
+        Fills both CSR directions from two parallel arrays holding
+        the person and movie index of every star row.
+        """
+        self.person_offsets, self.person_movies = _csr(
+            len(self.person_ids), star_people, star_movies)
+        self.movie_offsets, self.movie_people = _csr(
+            len(self.movie_ids), star_movies, star_people)
+
+    def movies_of(self, person):
+        return self.person_movies[self.person_offsets[person]:self.person_offsets[person + 1]]
+
+    def stars_of(self, movie):
+        return self.movie_people[self.movie_offsets[movie]:self.movie_offsets[movie + 1]]
+
+    def neighbors_for_person(self, person_id):
+        """
+        Returns (movie_id, person_id) pairs for people
+        who starred with a given person, like degrees3.neighbors_for_person.
+        """
+        neighbors = set()
+        for movie in self.movies_of(self.person_index[person_id]):
+            for person in self.stars_of(movie):
+                neighbors.add((self.movie_ids[movie], self.person_ids[person]))
+        return neighbors
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target.
+
+        If no possible path, returns None.
+        """
+        if source not in self.person_index or target not in self.person_index:
+            return None
+        start = self.person_index[source]
+        goal = self.person_index[target]
+        if start == goal:
+            return []
+
+        # parent_person[p] is -1 until p is reached; a movie's stars are
+        # all reached the first time the movie is used, so each movie
+        # only needs to be scanned once.
+        parent_person = array("i", [-1]) * len(self.person_ids)
+        parent_movie = array("i", [-1]) * len(self.person_ids)
+        used_movies = bytearray(len(self.movie_ids))
+        parent_person[start] = start
+
+        person_offsets = self.person_offsets
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_people = self.movie_people
+
+        queue = deque([start])
+        while queue:
+            person = queue.popleft()
+            for i in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[i]
+                if used_movies[movie]:
+                    continue
+                used_movies[movie] = 1
+                for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                    star = movie_people[j]
+                    if parent_person[star] != -1:
+                        continue
+                    parent_person[star] = person
+                    parent_movie[star] = movie
+                    if star == goal:
+                        return self._trace(parent_person, parent_movie, start, goal)
+                    queue.append(star)
+        return None
+
+    def single_source(self, source):
+        """
+        Runs one BFS from source over every person it can reach.
+
+        Returns (distances, parent_person, parent_movie) arrays indexed by
+        person, holding -1 for people who cannot be reached.
+        """
+        start = self.person_index[source]
+        distances = array("h", [-1]) * len(self.person_ids)
+        parent_person = array("i", [-1]) * len(self.person_ids)
+        parent_movie = array("i", [-1]) * len(self.person_ids)
+        used_movies = bytearray(len(self.movie_ids))
+        distances[start] = 0
+        parent_person[start] = start
+
+        person_offsets = self.person_offsets
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_people = self.movie_people
+
+        queue = deque([start])
+        while queue:
+            person = queue.popleft()
+            distance = distances[person] + 1
+            for i in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[i]
+                if used_movies[movie]:
+                    continue
+                used_movies[movie] = 1
+                for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                    star = movie_people[j]
+                    if distances[star] != -1:
+                        continue
+                    distances[star] = distance
+                    parent_person[star] = person
+                    parent_movie[star] = movie
+                    queue.append(star)
+        return distances, parent_person, parent_movie
+
+    def path_from_tree(self, tree, source, target):
+        """
+        Returns the (movie_id, person_id) path from source to target
+        using a tree returned by single_source(source), or None.
+        """
+        distances, parent_person, parent_movie = tree
+        goal = self.person_index[target]
+        if distances[goal] == -1:
+            return None
+        return self._trace(parent_person, parent_movie, self.person_index[source], goal)
+
+    def _trace(self, parent_person, parent_movie, start, goal):
+        path = []
+        person = goal
+        while person != start:
+            path.append((self.movie_ids[parent_movie[person]], self.person_ids[person]))
+            person = parent_person[person]
+        path.reverse()
+        return path
+
+
+def _csr(size, rows, columns):
+    """
+    Returns (offsets, indexes) arrays grouping columns by row,
+    using a counting sort over the row numbers.
+    """
+    offsets = array("i", [0]) * (size + 1)
+    for row in rows:
+        offsets[row + 1] += 1
+    for i in range(size):
+        offsets[i + 1] += offsets[i]
+    indexes = array("i", [0]) * len(rows)
+    position = array("i", offsets[:-1])
+    for row, column in zip(rows, columns):
+        indexes[position[row]] = column
+        position[row] += 1
+    return offsets, indexes
+
+
+def _load_tables(graph, directory):
+    """
+    Load people and movies from CSV files into graph.
+    """
+    # Load people
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for person_id, name, birth in reader:
+            graph.add_person(person_id, name, birth)
+
+    # Load movies
+    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for movie_id, title, year in reader:
+            graph.add_movie(movie_id, title, year)
+
+
+def load_csr(directory):
+    """
+    Load data from CSV files into a CSRGraph.
+    """
+    graph = CSRGraph()
+    _load_tables(graph, directory)
+
+    # Load stars, skipping rows that point at unknown people or movies
+    star_people = array("i")
+    star_movies = array("i")
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for person_id, movie_id in reader:
+            person = graph.person_index.get(person_id)
+            movie = graph.movie_index.get(movie_id)
+            if person is None or movie is None:
+                continue
+            star_people.append(person)
+            star_movies.append(movie)
+
+    graph.build_adjacency(star_people, star_movies)
+    return graph
+
+
+def _star_rows(f, buffer_bytes):
+    """
+    Yields the rows of an open stars.csv, reading about buffer_bytes
+    of the file at a time.
+    """
+    f.seek(0)
+    f.readline()
+    while True:
+        lines = f.readlines(buffer_bytes)
+        if not lines:
+            return
+        yield from csv.reader(lines)
+
+
+def table_bytes(graph):
+    """
+    Returns the bytes held by the id, name, birth, title and year tables
+    of graph and its person_index, movie_index and names dicts, counting
+    each shared (interned) string once.
+    """
+    total = 0
+    seen = set()
+    for table in [graph.person_ids, graph.person_names, graph.person_births,
+                  graph.movie_ids, graph.movie_titles, graph.movie_years]:
+        total += sys.getsizeof(table)
+        for value in table:
+            if id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+    total += sys.getsizeof(graph.person_index) + sys.getsizeof(graph.movie_index)
+    total += sys.getsizeof(graph.names)
+    for name, indexes in graph.names.items():
+        total += sys.getsizeof(name) + sys.getsizeof(indexes)
+    return total
+
+
+def stream_csr(directory, buffer_bytes=1 << 20, memory_limit=None):
+    """
+    Load data from CSV files into a CSRGraph without holding the star
+    rows in memory.
+
+    stars.csv is read twice in chunks of about buffer_bytes: the first
+    pass counts the movies of every person and the stars of every movie,
+    which sizes the CSR arrays exactly; the second pass fills them in.
+    Raises MemoryError if the tables and indexes of people and movies
+    take more than memory_limit bytes, or, before allocating the
+    adjacency, if it would take the total past memory_limit.
+    """
+    graph = CSRGraph()
+    _load_tables(graph, directory)
+    tables = table_bytes(graph) if memory_limit is not None else 0
+    if memory_limit is not None and tables > memory_limit:
+        raise MemoryError(f"tables need {tables} bytes, limit is {memory_limit}")
+    person_index = graph.person_index
+    movie_index = graph.movie_index
+
+    person_offsets = array("i", [0]) * (len(graph.person_ids) + 1)
+    movie_offsets = array("i", [0]) * (len(graph.movie_ids) + 1)
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        for person_id, movie_id in _star_rows(f, buffer_bytes):
+            person = person_index.get(person_id)
+            movie = movie_index.get(movie_id)
+            if person is None or movie is None:
+                continue
+            person_offsets[person + 1] += 1
+            movie_offsets[movie + 1] += 1
+
+        for i in range(len(graph.person_ids)):
+            person_offsets[i + 1] += person_offsets[i]
+        for i in range(len(graph.movie_ids)):
+            movie_offsets[i + 1] += movie_offsets[i]
+
+        # The offsets already held, the two index arrays of one entry
+        # per star row, and the fill cursors copied from the offsets
+        offsets = len(person_offsets) + len(movie_offsets)
+        needed = tables + person_offsets.itemsize * (2 * person_offsets[-1] + 2 * offsets)
+        if memory_limit is not None and needed > memory_limit:
+            raise MemoryError(f"tables and adjacency need {needed} bytes, "
+                              f"limit is {memory_limit}")
+
+        person_movies = array("i", [0]) * person_offsets[-1]
+        movie_people = array("i", [0]) * movie_offsets[-1]
+        person_fill = array("i", person_offsets[:-1])
+        movie_fill = array("i", movie_offsets[:-1])
+        for person_id, movie_id in _star_rows(f, buffer_bytes):
+            person = person_index.get(person_id)
+            movie = movie_index.get(movie_id)
+            if person is None or movie is None:
+                continue
+            person_movies[person_fill[person]] = movie
+            person_fill[person] += 1
+            movie_people[movie_fill[movie]] = person
+            movie_fill[movie] += 1
+
+    graph.person_offsets = person_offsets
+    graph.person_movies = person_movies
+    graph.movie_offsets = movie_offsets
+    graph.movie_people = movie_people
+    return graph
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python csrgraph.py [directory]")
+    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+
+    # Parsed once into a binary snapshot, then memory-mapped on later runs
+    from snapshot import load_graph
+
+    print("Loading data...")
+    graph = load_graph(directory)
+    print("Data loaded.")
+
+    source = person_id_for_name(graph, input("Name: "))
+    if source is None:
+        sys.exit("Person not found.")
+    target = person_id_for_name(graph, input("Name: "))
+    if target is None:
+        sys.exit("Person not found.")
+
+    path = graph.shortest_path(source, target)
+
+    if path is None:
+        print("Not connected.")
+    else:
+        degrees = len(path)
+        print(f"{degrees} degrees of separation.")
+        path = [(None, source)] + path
+        for i in range(degrees):
+            person1 = graph.person_names[graph.person_index[path[i][1]]]
+            person2 = graph.person_names[graph.person_index[path[i + 1][1]]]
+            movie = graph.movie_titles[graph.movie_index[path[i + 1][0]]]
+            print(f"{i + 1}: {person1} and {person2} starred in {movie}")
+
+
+def person_id_for_name(graph, name):
+    """
+    Returns the IMDB id for a person's name,
+    resolving ambiguities as needed.
+    """
+    indexes = graph.names.get(name.lower(), [])
+    if len(indexes) == 0:
+        return None
+    elif len(indexes) > 1:
+        print(f"Which '{name}'?")
+        for index in indexes:
+            person_id = graph.person_ids[index]
+            name = graph.person_names[index]
+            birth = graph.person_births[index]
+            print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
+        person_id = input("Intended Person ID: ")
+        if person_id in [graph.person_ids[index] for index in indexes]:
+            return person_id
+        return None
+    else:
+        return graph.person_ids[indexes[0]]
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 import csv
+import itertools
+import os
+import pickle
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
+from namesearch import NameSearch
+from snapshot import source_signature
+from util import Node, DequeQueueFrontier, MultiParentNode, SearchMetrics
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -13,6 +18,29 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Prefix and fuzzy index over the keys of names, built by load_data
+name_search = NameSearch()
+
+# Maps person_ids to connected component labels, loaded from the
+# sidecar file that graphstats.py writes next to the CSV files
+components = {}
+STATS_NAME = "degrees.stats"
+
+# Counts (movie_id, person_id) pairs that lazy_neighbors did not have to
+# build, compared with neighbors_for_person for the same people, when
+# passed to it as counts (benchmark.py does)
+neighbor_counts = {"yielded": 0, "avoided": 0}
+
+# Landmark person_ids, and maps person_ids to a bytes object holding the
+# degrees of separation to each landmark (UNREACHABLE if not connected),
+# built by landmarks.py into a sidecar file next to the CSV files
+landmarks = []
+landmark_distances = {}
+UNREACHABLE = 255
+LANDMARKS_NAME = "degrees.landmarks"
+# Landmarks used to prune each landmark_shortest_path search
+ACTIVE_LANDMARKS = 2
+
 
 def load_data(directory):
     """
@@ -52,15 +80,51 @@ def load_data(directory):
             except KeyError:
                 pass
 
+    # Index names for autocomplete and typo-tolerant lookup
+    name_search.build(names)
+
+
+def load_components(directory):
+    """
+    Loads component labels from the graphstats.py sidecar of directory,
+    unless it is missing or the CSV files changed since it was written.
+    """
+    components.clear()
+    try:
+        with open(os.path.join(directory, STATS_NAME), "rb") as f:
+            stats = pickle.load(f)
+        if stats["sources"] != source_signature(directory, hashes=False):
+            return
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+        return
+    components.update(zip(stats["person_ids"], stats["labels"]))
+
+
+def connected(source, target):
+    """
+    Returns False if the component labels show the source and target
+    cannot be connected, True otherwise (including when unknown).
+    """
+    if source not in components or target not in components:
+        return True
+    return components[source] == components[target]
+
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    args = sys.argv[1:]
+    track_memory = "--memory" in args
+    if track_memory:
+        args.remove("--memory")
+    if len(args) > 2:
+        sys.exit("Usage: python degrees.py [directory] [metrics.json|metrics.csv] [--memory]")
+    directory = args[0] if len(args) >= 1 else "large"
+    metrics = SearchMetrics(track_memory) if len(args) == 2 or track_memory else None
 
     # Load data from files into memory
     print("Loading data...")
     load_data(directory)
+    load_components(directory)
+    load_landmark_index(directory)
     print("Data loaded.")
 
     source = person_id_for_name(input("Name: "))
@@ -70,7 +134,22 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    # People in different components fail fast without a search.
+    if connected(source, target):
+        if metrics is not None:
+            metrics.start()
+        if landmarks:
+            path = landmark_shortest_path(source, target, metrics)
+        else:
+            path = bidirectional_shortest_path(source, target, metrics)
+        if metrics is not None:
+            metrics.stop()
+            if len(args) == 2:
+                metrics.export(args[1])
+            if track_memory:
+                print(f"Peak memory: {metrics.memory_peak / 1024:.1f} KiB")
+    else:
+        path = None
 
     if path is None:
         print("Not connected.")
@@ -85,32 +164,41 @@ def main():
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def shortest_path(source, target, metrics=None):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
+    If given, metrics (a util.SearchMetrics) records every expansion.
+
     If no possible path, returns None.
     """
-    queue = QueueFrontier()
-    explored = []
+    if source == target:
+        return []
+
+    queue = DequeQueueFrontier()
     start = Node(source, None, None)
     queue.add(start)
-    print(source)
-    print(queue.contains_state(source))
+
+    # reached holds every person already in queue or explored,
+    # used_movies every movie whose stars were already walked.
+    reached = {source}
+    used_movies = set()
 
     while True:
         if queue.empty():
             return None
         node = queue.remove()
-        # nb are the closest movie-person relations for
-        # the current person_id, contained in node.state.
-        nb = neighbors_for_person(node.state)
-        for action, state in nb:
+        if metrics is not None:
+            metrics.expand_node(node, len(queue))
+        # Walk the movies of the current person_id, contained in
+        # node.state, one at a time so the search can stop as soon
+        # as the target turns up.
+        for action, state in lazy_neighbors(node.state, used_movies):
             # Here, action is movie_id, state is person_id.
-            # If state is not in queue and explored,
-            # create new child node.
-            if not queue.contains_state(state) and state not in explored:
+            # If state was not reached before, create new child node.
+            if state not in reached:
+                reached.add(state)
                 child = Node(state=state, parent=node, action=action)
                 # If child's state is target, the goal is achieved.
                 if child.state == target:
@@ -125,11 +213,356 @@ def shortest_path(source, target):
                     # If child's state is not target,
                     # add new node child to queue.
                     queue.add(child)
-        # explored is a list so that new entries can be appended.
-        # append's order can be seen from print function.
-        if node.state not in explored:
-            explored.append(node.state)
-        print(explored)
+
+
+def bidirectional_shortest_path(source, target, metrics=None, keep=None):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, like shortest_path,
+    but searches from both ends at once.
+
+    Each round expands one whole layer of the smaller frontier,
+    and stops in the layer where the two searches meet.
+    If given, metrics records every expansion, and a person reached at
+    depth d from the source (forward) or the target is only added when
+    keep(person_id, d, forward) is true.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+
+    # parents map person_id to (movie_id, person_id) of the person one
+    # step closer to that side's start; depths hold the layer number.
+    forward = {"parents": {source: None}, "depths": {source: 0}, "layer": [source]}
+    backward = {"parents": {target: None}, "depths": {target: 0}, "layer": [target]}
+
+    forward["used_movies"] = set()
+    backward["used_movies"] = set()
+
+    while forward["layer"] and backward["layer"]:
+        # Grow the smaller frontier.
+        if len(forward["layer"]) <= len(backward["layer"]):
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+
+        next_layer = []
+        meeting = None
+        best = None
+        for person_id in side["layer"]:
+            depth = side["depths"][person_id] + 1
+            if metrics is not None:
+                metrics.expand(depth - 1, len(forward["layer"]) + len(backward["layer"]))
+            for movie_id, neighbor in lazy_neighbors(person_id, side["used_movies"]):
+                if neighbor not in side["parents"]:
+                    if keep is not None and not keep(neighbor, depth, side is forward):
+                        continue
+                    side["parents"][neighbor] = (movie_id, person_id)
+                    side["depths"][neighbor] = depth
+                    next_layer.append(neighbor)
+                # Keep the meeting point with the shortest total length
+                # found in this layer.
+                if neighbor in other["depths"]:
+                    total = side["depths"][neighbor] + other["depths"][neighbor]
+                    if best is None or total < best:
+                        best = total
+                        meeting = neighbor
+        if meeting is not None:
+            return _join_paths(forward["parents"], backward["parents"], meeting)
+        side["layer"] = next_layer
+
+    return None
+
+
+def _join_paths(forward_parents, backward_parents, meeting):
+    """
+    Builds the (movie_id, person_id) path from the source to the target
+    through the person where the two searches met.
+    """
+    path = []
+    person_id = meeting
+    while forward_parents[person_id] is not None:
+        movie_id, parent = forward_parents[person_id]
+        path.append((movie_id, person_id))
+        person_id = parent
+    path.reverse()
+
+    person_id = meeting
+    while backward_parents[person_id] is not None:
+        movie_id, child = backward_parents[person_id]
+        path.append((movie_id, child))
+        person_id = child
+    return path
+
+
+def shortest_path_dag(source, target):
+    """
+    Returns the node of the target in the DAG of every shortest path
+    from the source, or None if no possible path.
+
+    The BFS keeps every (parent, movie) pair that reaches a person
+    at its shortest depth, and stops after the target's layer.
+    """
+    start = MultiParentNode(source, None, None)
+    if source == target:
+        return start
+
+    queue = DequeQueueFrontier()
+    queue.add(start)
+    nodes = {source: start}
+    goal = None
+
+    while not queue.empty():
+        node = queue.remove()
+        # Every shortest path to the target is complete once the
+        # layer before the target has been expanded.
+        if goal is not None and node.depth >= goal.depth:
+            break
+        # Movies are not skipped here: two people of the same layer in
+        # one movie are both parents of its stars in the next layer.
+        for action, state in neighbors_for_person(node.state):
+            child = nodes.get(state)
+            if child is None:
+                child = MultiParentNode(state, node, action, node.depth + 1)
+                nodes[state] = child
+                if state == target:
+                    goal = child
+                else:
+                    queue.add(child)
+            elif child.depth == node.depth + 1:
+                child.add_parent(node, action)
+
+    return goal
+
+
+def _paths_to(node):
+    """
+    Yields each (movie_id, person_id) path that reaches node
+    through the shortest path DAG, one at a time.
+    """
+    if not node.parents:
+        yield []
+        return
+    for parent, action in node.parents:
+        for path in _paths_to(parent):
+            path.append((action, node.state))
+            yield path
+
+
+def all_shortest_paths(source, target):
+    """
+    Yields every shortest list of (movie_id, person_id) pairs
+    that connect the source to the target.
+
+    Paths are generated lazily from the DAG, so pairs with a huge
+    number of equal-length paths do not need them all in memory.
+    """
+    goal = shortest_path_dag(source, target)
+    if goal is not None:
+        yield from _paths_to(goal)
+
+
+def k_shortest_paths(source, target, k):
+    """
+    Returns a list of at most k shortest paths from the source to
+    the target, all of the same length.
+    """
+    return list(itertools.islice(all_shortest_paths(source, target), k))
+
+
+def distances_from(source):
+    """
+    Returns a dict mapping every person connected to the source
+    to their degrees of separation from the source.
+    """
+    distances = {source: 0}
+    used_movies = set()
+    layer = [source]
+    depth = 0
+    while layer:
+        depth += 1
+        next_layer = []
+        for person_id in layer:
+            for movie_id in people[person_id]["movies"]:
+                # A movie's stars are all reached the first time it is used.
+                if movie_id in used_movies:
+                    continue
+                used_movies.add(movie_id)
+                for star in movies[movie_id]["stars"]:
+                    if star not in distances:
+                        distances[star] = depth
+                        next_layer.append(star)
+        layer = next_layer
+    return distances
+
+
+def build_landmark_index(count=16):
+    """
+    Picks the count people with the most co-star appearances as landmarks
+    and stores every person's distance to each of them.
+    """
+    def reach(person_id):
+        return sum(len(movies[movie_id]["stars"]) for movie_id in people[person_id]["movies"])
+
+    landmarks[:] = sorted(people, key=reach, reverse=True)[:count]
+    columns = [distances_from(landmark) for landmark in landmarks]
+    landmark_distances.clear()
+    for person_id in people:
+        landmark_distances[person_id] = bytes(
+            min(column.get(person_id, UNREACHABLE), UNREACHABLE) for column in columns
+        )
+
+
+def landmark_path(directory):
+    return os.path.join(directory, LANDMARKS_NAME)
+
+
+def save_landmark_index(directory):
+    """
+    Writes the landmark index to the sidecar file of directory, with
+    the signature of the CSV files it was built from.
+    """
+    index = {
+        "sources": source_signature(directory, hashes=False),
+        "landmarks": landmarks,
+        "distances": landmark_distances,
+    }
+    with open(landmark_path(directory), "wb") as f:
+        pickle.dump(index, f, pickle.HIGHEST_PROTOCOL)
+
+
+def load_landmark_index(directory):
+    """
+    Loads the landmark index from the sidecar file of directory, unless
+    it is missing or the CSV files changed since it was written.
+    Returns True if it was loaded.
+    """
+    landmarks.clear()
+    landmark_distances.clear()
+    try:
+        with open(landmark_path(directory), "rb") as f:
+            index = pickle.load(f)
+        if index["sources"] != source_signature(directory, hashes=False):
+            return False
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+        return False
+    landmarks.extend(index["landmarks"])
+    landmark_distances.update(index["distances"])
+    return True
+
+
+def landmark_bounds(source, target):
+    """
+    Returns (lower, upper) bounds on the degrees of separation between
+    source and target from the landmark index. upper is None if no
+    landmark reaches both. Returns None if a landmark proves they are
+    not connected.
+    """
+    lower = 0
+    upper = None
+    for to_source, to_target in zip(landmark_distances.get(source, b""),
+                                    landmark_distances.get(target, b"")):
+        # A landmark connected to only one of them splits them apart.
+        if (to_source == UNREACHABLE) != (to_target == UNREACHABLE):
+            return None
+        if to_source == UNREACHABLE:
+            continue
+        lower = max(lower, abs(to_source - to_target))
+        if upper is None or to_source + to_target < upper:
+            upper = to_source + to_target
+    return lower, upper
+
+
+def degrees_from_landmarks(source, target):
+    """
+    Returns the degrees of separation if the landmark bounds already
+    pin it down, None if they prove the two are not connected,
+    and -1 if a search is still needed.
+    """
+    bounds = landmark_bounds(source, target)
+    if bounds is None:
+        return None
+    lower, upper = bounds
+    return lower if lower == upper else -1
+
+
+def landmark_shortest_path(source, target, metrics=None, prune=False):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, like shortest_path,
+    using the landmark index to skip the search where it can.
+
+    If the bounds prove the two are not connected, returns None at once.
+    If they pin the degrees down, a shortest path runs through the
+    landmark giving the upper bound, and is walked without a search.
+    Otherwise bidirectional_shortest_path runs. If prune, it only keeps
+    a person reached at depth d if d plus their lower bound to the other
+    end still fits within the upper bound.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+    bounds = landmark_bounds(source, target)
+    if bounds is None:
+        return None
+    lower, upper = bounds
+    if upper is None or (lower < upper and not prune):
+        return bidirectional_shortest_path(source, target, metrics)
+
+    source_row = landmark_distances[source]
+    target_row = landmark_distances[target]
+    if lower == upper:
+        via = min(range(len(landmarks)), key=lambda i: source_row[i] + target_row[i])
+        to_source = _descend(target, via)
+        path = _descend(source, via)
+        # Walk the target's path to the landmark backwards
+        people_back = [target] + [person_id for _, person_id in to_source]
+        for i in range(len(to_source) - 1, -1, -1):
+            path.append((to_source[i][0], people_back[i]))
+        return path
+
+    # Prune with the few landmarks that best separate the two ends,
+    # as they are the likeliest to bound a detour
+    reachable = [i for i in range(len(landmarks)) if source_row[i] != UNREACHABLE]
+    active = sorted(reachable, key=lambda i: abs(source_row[i] - target_row[i]),
+                    reverse=True)[:ACTIVE_LANDMARKS]
+    ends = {
+        True: [(i, target_row[i]) for i in active],
+        False: [(i, source_row[i]) for i in active],
+    }
+
+    def keep(person_id, depth, forward):
+        row = landmark_distances.get(person_id)
+        if row is None:
+            return True
+        slack = upper - depth
+        for i, d in ends[forward]:
+            if abs(row[i] - d) > slack:
+                return False
+        return True
+
+    return bidirectional_shortest_path(source, target, metrics, keep)
+
+
+def _descend(person_id, landmark):
+    """
+    Returns the (movie_id, person_id) path from person_id to the
+    landmark numbered landmark, stepping each time to a co-star one
+    degree closer to it.
+    """
+    path = []
+    distance = landmark_distances[person_id][landmark]
+    while distance > 0:
+        step = next((movie_id, star)
+                    for movie_id in people[person_id]["movies"]
+                    for star in movies[movie_id]["stars"]
+                    if landmark_distances[star][landmark] == distance - 1)
+        path.append(step)
+        person_id = step[1]
+        distance -= 1
+    return path
 
 
 def person_id_for_name(name):
@@ -139,6 +572,18 @@ def person_id_for_name(name):
     """
     person_ids = list(names.get(name.lower(), set()))
     if len(person_ids) == 0:
+        # No exact match: offer the closest names instead.
+        suggestions = name_search.search(name, 5)
+        if not suggestions:
+            return None
+        print(f"No '{name}' found. Did you mean:")
+        for suggestion in suggestions:
+            for person_id in names[suggestion]:
+                person = people[person_id]
+                print(f"ID: {person_id}, Name: {person['name']}, Birth: {person['birth']}")
+        person_id = input("Intended Person ID: ")
+        if person_id in people:
+            return person_id
         return None
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
@@ -171,5 +616,35 @@ def neighbors_for_person(person_id):
     return neighbors
 
 
+def lazy_neighbors(person_id, used_movies, counts=None):
+    """
+    Yields (movie_id, person_id) pairs for people who starred with a
+    given person, one movie at a time, skipping and then marking movies
+    in used_movies. A movie's cast is only walked once per search, and
+    nothing is built for movies the caller never gets to.
+
+    If given, counts (a dict like neighbor_counts) gets the pairs of the
+    movies walked added to "yielded", and once the generator is done or
+    closed, the pairs of the other movies added to "avoided".
+    """
+    movie_ids = people[person_id]["movies"]
+    walked = 0
+    try:
+        for movie_id in movie_ids:
+            if movie_id in used_movies:
+                continue
+            used_movies.add(movie_id)
+            stars = movies[movie_id]["stars"]
+            if counts is not None:
+                walked += len(stars)
+            for star in stars:
+                yield movie_id, star
+    finally:
+        if counts is not None:
+            counts["yielded"] += walked
+            total = sum(len(movies[movie_id]["stars"]) for movie_id in movie_ids)
+            counts["avoided"] += total - walked
+
+
 if __name__ == "__main__":
     main()
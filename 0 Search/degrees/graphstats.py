@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+import os
+import pickle
+import sys
+from array import array
+from collections import Counter
+
+import degrees3
+from snapshot import source_signature
+
+
+def stats_path(directory):
+    return os.path.join(directory, degrees3.STATS_NAME)
+
+
+def co_star_degrees():
+    """
+    Returns a dict mapping each person_id to the number of
+    other people they starred with.
+    """
+    degrees = {}
+    for person_id, person in degrees3.people.items():
+        co_stars = set()
+        for movie_id in person["movies"]:
+            co_stars.update(degrees3.movies[movie_id]["stars"])
+        co_stars.discard(person_id)
+        degrees[person_id] = len(co_stars)
+    return degrees
+
+
+def find(parents, i):
+    # Path halving keeps the trees shallow without recursion.
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def components(person_ids):
+    """
+    Returns an array of component labels aligned with person_ids,
+    using union-find over the stars of every movie. Labels are
+    numbered from 0 by decreasing component size.
+    """
+    index = {person_id: i for i, person_id in enumerate(person_ids)}
+    parents = array("i", range(len(person_ids)))
+    sizes = array("i", [1]) * len(person_ids)
+    for movie in degrees3.movies.values():
+        stars = [index[person_id] for person_id in movie["stars"] if person_id in index]
+        for star in stars[1:]:
+            a = find(parents, stars[0])
+            b = find(parents, star)
+            if a == b:
+                continue
+            if sizes[a] < sizes[b]:
+                a, b = b, a
+            parents[b] = a
+            sizes[a] += sizes[b]
+
+    roots = [find(parents, i) for i in range(len(person_ids))]
+    ranking = Counter(roots).most_common()
+    labels = {root: label for label, (root, _) in enumerate(ranking)}
+    return array("i", (labels[root] for root in roots))
+
+
+def eccentricities(start, sweeps=4):
+    """
+    Estimates eccentricities in the component of start with repeated
+    double sweeps: each BFS starts from the farthest person found by
+    the previous one. Returns (person_id, eccentricity) pairs; the
+    largest is a lower bound on the component's diameter.
+    """
+    results = []
+    person_id = start
+    for _ in range(sweeps):
+        distances = degrees3.distances_from(person_id)
+        farthest = max(distances, key=distances.get)
+        results.append((person_id, distances[farthest]))
+        if any(farthest == swept for swept, _ in results):
+            break
+        person_id = farthest
+    return results
+
+
+def compute_stats(directory, hubs=10):
+    person_ids = list(degrees3.people)
+    degrees = co_star_degrees()
+    labels = components(person_ids)
+    sizes = Counter(labels)
+    values = sorted(degrees.values())
+    top = sorted(person_ids, key=degrees.get, reverse=True)[:hubs]
+
+    return {
+        "sources": source_signature(directory, hashes=False),
+        "people": len(person_ids),
+        "movies": len(degrees3.movies),
+        "degree_distribution": sorted(Counter(values).items()),
+        "degree_mean": sum(values) / len(values) if values else 0,
+        "degree_median": values[len(values) // 2] if values else 0,
+        "hubs": [(person_id, degrees[person_id]) for person_id in top],
+        "component_count": len(sizes),
+        "component_sizes": sorted(sizes.values(), reverse=True),
+        "eccentricities": eccentricities(top[0]) if top else [],
+        "person_ids": person_ids,
+        "labels": labels,
+    }
+
+
+def write_stats(directory, stats):
+    # Read back by degrees3.load_components
+    with open(stats_path(directory), "wb") as f:
+        pickle.dump(stats, f, pickle.HIGHEST_PROTOCOL)
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python graphstats.py [directory]")
+    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+
+    print("Loading data...")
+    degrees3.load_data(directory)
+    print("Data loaded.")
+
+    stats = compute_stats(directory)
+    write_stats(directory, stats)
+
+    print(f"People: {stats['people']}, movies: {stats['movies']}")
+    print(f"Co-star degree: mean {stats['degree_mean']:.1f}, "
+          f"median {stats['degree_median']}, max {stats['degree_distribution'][-1][0]}")
+    print(f"Components: {stats['component_count']}, "
+          f"largest: {stats['component_sizes'][:5]}")
+    for person_id, degree in stats["hubs"]:
+        print(f"Hub: {degrees3.people[person_id]['name']} ({degree} co-stars)")
+    for person_id, eccentricity in stats["eccentricities"]:
+        print(f"Eccentricity of {degrees3.people[person_id]['name']}: {eccentricity}")
+    print(f"Wrote {stats_path(directory)}.")
+
+
+if __name__ == "__main__":
+    main()
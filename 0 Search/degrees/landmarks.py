@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+
+import degrees3
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ["build", "check"] or len(sys.argv) > 4 \
+            or (sys.argv[1] == "check" and len(sys.argv) > 3):
+        sys.exit("Usage: python landmarks.py build [directory] [count]\n"
+                 "       python landmarks.py check [directory]")
+    command = sys.argv[1]
+    directory = sys.argv[2] if len(sys.argv) >= 3 else "large"
+    count = int(sys.argv[3]) if len(sys.argv) == 4 else 16
+
+    print("Loading data...")
+    degrees3.load_data(directory)
+    print("Data loaded.")
+
+    path = degrees3.landmark_path(directory)
+    if command == "build":
+        start = time.perf_counter()
+        degrees3.build_landmark_index(count)
+        degrees3.save_landmark_index(directory)
+        print(f"Index of {len(degrees3.landmarks)} landmarks built in "
+              f"{time.perf_counter() - start:.3f}s")
+        print(f"Wrote {path}, {os.path.getsize(path) / 1024:.1f} KiB.")
+    elif degrees3.load_landmark_index(directory):
+        for person_id in degrees3.landmarks:
+            print(f"Landmark: {degrees3.people[person_id]['name']}")
+        print(f"{path} is current, {len(degrees3.landmark_distances)} people indexed.")
+    else:
+        sys.exit(f"{path} is missing or out of date; "
+                 f"run python landmarks.py build {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import bisect
+import heapq
+from array import array
+
+
+class NameSearch():
+    """
+    Prefix and typo-tolerant lookup over lowercase names.
+
+    Prefix matches come from a sorted list of names searched with bisect.
+    Fuzzy matches work a word at a time: every word of the query is
+    matched to the known words one typo away through an index of their
+    single-character deletions, and only names holding a match for each
+    query word are ranked by edit distance. Both indexes are built once
+    by build, so lookups never pay for them.
+    """
+    def __init__(self, max_scan=5000, shortlist=20):
+        # At most this many names are checked per fuzzy query, and
+        # the shortlist closest by word are ranked by edit distance.
+        self.max_scan = max_scan
+        self.shortlist = shortlist
+        self.names = {}
+        self.sorted_names = None
+        self.words = None
+        self.deletions = None
+
+    def build(self, names):
+        """
+        Indexes every key of names, a dict keyed by lowercase name,
+        for lookups.
+        """
+        self.names = names
+        self.sorted_names = None
+        self.words = None
+        self.deletions = None
+        self._sorted()
+        self._index()
+
+    def _sorted(self):
+        if self.sorted_names is None:
+            self.sorted_names = sorted(self.names)
+        return self.sorted_names
+
+    def _index(self):
+        """
+        Builds self.words, mapping each word to the array of positions in
+        sorted_names of the names holding it, and self.deletions, mapping
+        each word with one character deleted to the words it came from.
+        """
+        if self.words is not None:
+            return
+        words = {}
+        for i, name in enumerate(self._sorted()):
+            for word in set(name.split()):
+                posting = words.get(word)
+                if posting is None:
+                    posting = words[word] = []
+                posting.append(i)
+        deletions = {}
+        for word in words:
+            for variant in _deletions(word):
+                deletions.setdefault(variant, []).append(word)
+        self.words = {word: array("i", posting) for word, posting in words.items()}
+        self.deletions = deletions
+
+    def similar_words(self, word):
+        """
+        Returns a dict mapping the known words within two edits of word
+        that differ from it by at most one deletion each way to their
+        edit distance from word. That covers every word one insertion,
+        deletion or substitution away.
+        """
+        self._index()
+        similar = {}
+        if word in self.words:
+            similar[word] = 0
+        for longer in self.deletions.get(word, []):
+            similar[longer] = 1
+        for variant in _deletions(word):
+            if variant in self.words:
+                similar[variant] = 1
+            for other in self.deletions.get(variant, []):
+                if other not in similar:
+                    # Same length, each one deletion from variant: a
+                    # single substitution if they differ in one place
+                    mismatches = sum(a != b for a, b in zip(word, other))
+                    similar[other] = 1 if mismatches == 1 else 2
+        return similar
+
+    def complete(self, prefix, k=10):
+        """
+        Returns up to k names starting with prefix, in alphabetical order.
+        """
+        prefix = prefix.lower()
+        sorted_names = self._sorted()
+        start = bisect.bisect_left(sorted_names, prefix)
+        matches = []
+        for name in sorted_names[start:start + k]:
+            if not name.startswith(prefix):
+                break
+            matches.append(name)
+        return matches
+
+    def fuzzy(self, query, k=10, max_distance=None):
+        """
+        Returns up to k (name, edit distance) pairs closest to query,
+        closest first. Names more than max_distance edits away (by default
+        a third of the query length) are left out, as are names missing a
+        word close to each query word.
+        """
+        query = query.lower()
+        if max_distance is None:
+            max_distance = max(1, len(query) // 3)
+        matches = [self.similar_words(word) for word in query.split()]
+        if not matches or not all(matches):
+            return []
+
+        # Walk the names of the query word with the fewest, checking
+        # that they hold a close word for every other query word, and
+        # score them by their word distances
+        words = self.words
+        sorted_names = self.sorted_names
+        pivot = min(matches, key=lambda match: sum(len(words[word]) for word in match))
+        others = [match for match in matches if match is not pivot]
+        length = len(query)
+        scored = {}
+        budget = self.max_scan
+        for word in sorted(pivot, key=pivot.get):
+            posting = words[word]
+            for i in posting[:budget]:
+                name = sorted_names[i]
+                score = pivot[word] + abs(len(name) - length)
+                if others:
+                    name_words = name.split()
+                    for match in others:
+                        distances = [match[name_word] for name_word in name_words if name_word in match]
+                        if not distances:
+                            break
+                        score += min(distances)
+                    else:
+                        scored[name] = min(score, scored.get(name, score))
+                else:
+                    scored[name] = min(score, scored.get(name, score))
+            budget -= len(posting)
+            if budget <= 0:
+                break
+
+        # Only the names closest by word get a full edit distance
+        ranked = []
+        for name in heapq.nsmallest(min(self.shortlist, 2 * k), scored, key=scored.get):
+            distance = edit_distance(query, name, max_distance)
+            if distance <= max_distance:
+                ranked.append((distance, name))
+        ranked.sort()
+        return [(name, distance) for distance, name in ranked[:k]]
+
+    def search(self, query, k=10):
+        """
+        Returns up to k names for query: prefix completions first,
+        then the closest fuzzy matches.
+        """
+        results = self.complete(query, k)
+        if len(results) == k:
+            return results
+        for name, _ in self.fuzzy(query, k):
+            if len(results) == k:
+                break
+            if name not in results:
+                results.append(name)
+        return results
+
+
+def _deletions(word):
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def edit_distance(a, b, limit=None):
+    """
+    Returns the Levenshtein distance between two strings. If limit is
+    given, stops as soon as the distance must exceed it and returns
+    limit + 1.
+    """
+    if limit is not None and abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from csrgraph import CSRGraph, stream_csr
+
+# Bump whenever the layout below changes, so old snapshots are rebuilt.
+SNAPSHOT_VERSION = 1
+SNAPSHOT_NAME = "degrees.snapshot"
+SOURCES = ["people.csv", "movies.csv", "stars.csv"]
+
+MAGIC = b"DEGSNAP\0"
+PREFIX = struct.Struct("<8sQ")
+ALIGN = 8
+
+# Snapshot layout: MAGIC, header length, JSON header, then every section
+# padded to ALIGN bytes. The header records the snapshot version, the byte
+# order, the CSV signatures the snapshot was built from, and for each
+# section its (offset, byte length, array typecode) after the header.
+
+
+class StringTable():
+    """
+    Read-only list of strings stored as one UTF-8 blob plus offsets.
+    Strings are only decoded when accessed.
+    """
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("string table index out of range")
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class _SortedView():
+    """
+    Sequence of table[order[i]] (optionally lowercased), which is sorted,
+    so that bisect can search it without building a dict.
+    """
+    def __init__(self, table, order, lower=False):
+        self.table = table
+        self.order = order
+        self.lower = lower
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, i):
+        value = self.table[self.order[i]]
+        return value.lower() if self.lower else value
+
+
+class SortedIndex():
+    """
+    Maps IMDB ids to dense indexes with a binary search over
+    a sorted permutation, like CSRGraph.person_index.
+    """
+    def __init__(self, table, order):
+        self.order = order
+        self.keys = _SortedView(table, order)
+
+    def get(self, key, default=None):
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.order[i]
+        return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __getitem__(self, key):
+        index = self.get(key)
+        if index is None:
+            raise KeyError(key)
+        return index
+
+
+class NameIndex():
+    """
+    Maps lowercase names to the list of person indexes with that name,
+    like CSRGraph.names.
+    """
+    def __init__(self, names, order):
+        self.order = order
+        self.keys = _SortedView(names, order, lower=True)
+
+    def get(self, name, default=None):
+        lo = bisect.bisect_left(self.keys, name)
+        hi = bisect.bisect_right(self.keys, name, lo)
+        if lo == hi:
+            return default
+        return list(self.order[lo:hi])
+
+
+def snapshot_path(directory):
+    return os.path.join(directory, SNAPSHOT_NAME)
+
+
+def file_hash(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def source_signature(directory, hashes=True):
+    """
+    Returns size, mtime and (optionally) SHA-256 of every CSV file.
+    """
+    signature = {}
+    for name in SOURCES:
+        path = os.path.join(directory, name)
+        stat = os.stat(path)
+        signature[name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if hashes:
+            signature[name]["sha256"] = file_hash(path)
+    return signature
+
+
+def is_current(header, directory):
+    """
+    Returns True if the snapshot header matches this program and the CSV
+    files. Files whose mtime changed are hashed, so a touched but
+    unchanged file does not force a rebuild; their new mtimes are put in
+    the header and their names listed in header["touched"], for
+    rewrite_header to save so they are not hashed again.
+    """
+    if header.get("version") != SNAPSHOT_VERSION or header.get("byteorder") != sys.byteorder:
+        return False
+    try:
+        current = source_signature(directory, hashes=False)
+    except OSError:
+        return False
+    touched = []
+    for name, stat in current.items():
+        built = header["sources"].get(name)
+        if built is None or built["size"] != stat["size"]:
+            return False
+        if built["mtime_ns"] != stat["mtime_ns"]:
+            if built["sha256"] != file_hash(os.path.join(directory, name)):
+                return False
+            touched.append((name, stat["mtime_ns"]))
+    for name, mtime_ns in touched:
+        header["sources"][name]["mtime_ns"] = mtime_ns
+    header["touched"] = [name for name, _ in touched]
+    return True
+
+
+def rewrite_header(directory, header):
+    """
+    Rewrites the JSON header of the snapshot of directory in place,
+    padded with spaces to its old length, so the sections do not move.
+    Returns False, leaving the file alone, if the new header is longer.
+    """
+    fields = {key: header[key] for key in ["version", "byteorder", "sources", "sections"]}
+    data = json.dumps(fields).encode("utf-8")
+    if len(data) > header["length"]:
+        return False
+    with open(snapshot_path(directory), "r+b") as f:
+        f.seek(PREFIX.size)
+        f.write(data.ljust(header["length"]))
+    return True
+
+
+def _strings(values):
+    offsets = array("q", [0])
+    blob = bytearray()
+    for value in values:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return bytes(blob), offsets
+
+
+def write_snapshot(graph, directory, signature=None):
+    """
+    Writes graph to the snapshot file of directory, recording the
+    signature of the CSV files it was built from.
+    """
+    if signature is None:
+        signature = source_signature(directory)
+
+    person_order = sorted(range(len(graph.person_ids)), key=graph.person_ids.__getitem__)
+    movie_order = sorted(range(len(graph.movie_ids)), key=graph.movie_ids.__getitem__)
+    name_order = sorted(range(len(graph.person_names)),
+                        key=lambda i: graph.person_names[i].lower())
+
+    sections = {
+        "person_offsets": graph.person_offsets,
+        "person_movies": graph.person_movies,
+        "movie_offsets": graph.movie_offsets,
+        "movie_people": graph.movie_people,
+        "person_order": array("i", person_order),
+        "movie_order": array("i", movie_order),
+        "name_order": array("i", name_order),
+    }
+    for table in ["person_ids", "person_names", "person_births",
+                  "movie_ids", "movie_titles", "movie_years"]:
+        blob, offsets = _strings(getattr(graph, table))
+        sections[f"{table}.blob"] = blob
+        sections[f"{table}.offsets"] = offsets
+
+    layout = {}
+    position = 0
+    for name, data in sections.items():
+        size = len(data) * data.itemsize if isinstance(data, array) else len(data)
+        typecode = data.typecode if isinstance(data, array) else "B"
+        layout[name] = [position, size, typecode]
+        position += size + (-size % ALIGN)
+
+    header = json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "byteorder": sys.byteorder,
+        "sources": signature,
+        "sections": layout,
+    }).encode("utf-8")
+
+    path = snapshot_path(directory)
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        f.write(b"\0" * (-f.tell() % ALIGN))
+        for name, data in sections.items():
+            f.write(data)
+            f.write(b"\0" * (-f.tell() % ALIGN))
+    os.replace(temp, path)
+
+
+def read_header(f):
+    magic, length = PREFIX.unpack(f.read(PREFIX.size))
+    if magic != MAGIC:
+        raise ValueError("not a degrees snapshot")
+    header = json.loads(f.read(length))
+    header["length"] = length
+    data_start = PREFIX.size + length
+    header["data_start"] = data_start + (-data_start % ALIGN)
+    return header
+
+
+def map_snapshot(directory):
+    """
+    Memory-maps the snapshot of directory and returns a CSRGraph whose
+    arrays and tables are views into the mapping.
+    """
+    with open(snapshot_path(directory), "rb") as f:
+        header = read_header(f)
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(mapping)
+    sections = {}
+    for name, (offset, size, typecode) in header["sections"].items():
+        start = header["data_start"] + offset
+        sections[name] = view[start:start + size].cast(typecode)
+
+    graph = CSRGraph()
+    for table in ["person_ids", "person_names", "person_births",
+                  "movie_ids", "movie_titles", "movie_years"]:
+        setattr(graph, table, StringTable(sections[f"{table}.blob"],
+                                          sections[f"{table}.offsets"]))
+    graph.person_offsets = sections["person_offsets"]
+    graph.person_movies = sections["person_movies"]
+    graph.movie_offsets = sections["movie_offsets"]
+    graph.movie_people = sections["movie_people"]
+    graph.person_index = SortedIndex(graph.person_ids, sections["person_order"])
+    graph.movie_index = SortedIndex(graph.movie_ids, sections["movie_order"])
+    graph.names = NameIndex(graph.person_names, sections["name_order"])
+    return graph
+
+
+def load_graph(directory, memory_limit=None):
+    """
+    Returns the CSRGraph of directory, memory-mapped from its snapshot.
+    The snapshot is (re)built from the CSV files first if it is missing,
+    from another version, or older than the CSV files. CSV files that
+    were only touched have their new mtimes saved in the header, so
+    later loads do not hash them again. memory_limit bounds the
+    rebuild, as in stream_csr.
+    """
+    try:
+        with open(snapshot_path(directory), "rb") as f:
+            header = read_header(f)
+        current = is_current(header, directory)
+    except (OSError, ValueError, KeyError, struct.error):
+        current = False
+
+    if not current:
+        compile_snapshot(directory, memory_limit)
+    elif header["touched"]:
+        try:
+            refreshed = rewrite_header(directory, header)
+        except OSError:
+            # A read-only snapshot still loads, it is just hashed again
+            refreshed = True
+        if not refreshed:
+            compile_snapshot(directory, memory_limit)
+    return map_snapshot(directory)
+
+
+def compile_snapshot(directory, memory_limit=None):
+    """
+    Builds the snapshot of directory from its CSV files. Raises
+    MemoryError if the graph would take more than memory_limit bytes
+    while it is built.
+    """
+    # Sign the files before parsing them, so edits made while
+    # loading make the snapshot stale rather than silently wrong.
+    signature = source_signature(directory)
+    write_snapshot(stream_csr(directory, memory_limit=memory_limit), directory, signature)
+
+
+def parse_size(text):
+    """
+    Returns the bytes in a size such as 512000, 800K, 64M or 2G.
+    """
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper()
+    if text[-1:] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python snapshot.py [directory] [memory_limit]")
+    directory = sys.argv[1] if len(sys.argv) >= 2 else "large"
+    memory_limit = parse_size(sys.argv[2]) if len(sys.argv) == 3 else None
+
+    print("Compiling snapshot...")
+    try:
+        compile_snapshot(directory, memory_limit)
+    except MemoryError as e:
+        sys.exit(f"Not compiled: {e}")
+    size = os.path.getsize(snapshot_path(directory))
+    print(f"Wrote {snapshot_path(directory)} ({size} bytes).")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,10 @@
+import csv
+import json
+import time
+import tracemalloc
+from collections import Counter, deque
+
+
 class Node():
     def __init__(self, state, parent, action):
         self.state = state
@@ -36,3 +43,157 @@ class QueueFrontier(StackFrontier):
             node = self.frontier[0]
             self.frontier = self.frontier[1:]
             return node
+
+
+class DequeStackFrontier():
+    """
+    Stack frontier backed by a deque, with a count of each state it
+    holds so that add, remove and contains_state are all O(1).
+    Same API as StackFrontier, including adding a state more than once.
+    """
+    def __init__(self):
+        self.frontier = deque()
+        self.states = Counter()
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states[node.state] += 1
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier.pop()
+            self._forget(node.state)
+            return node
+
+    def _forget(self, state):
+        self.states[state] -= 1
+        if not self.states[state]:
+            del self.states[state]
+
+
+class DequeQueueFrontier(DequeStackFrontier):
+    """
+    Queue frontier backed by a deque, same API as QueueFrontier.
+    """
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier.popleft()
+            self._forget(node.state)
+            return node
+
+
+class MultiParentNode(Node):
+    """
+    Node that can be reached from several parents at the same depth,
+    so that a search can keep the whole DAG of shortest paths.
+    parents holds (parent node, action) pairs; parent and action are
+    the first pair found, as in Node.
+    """
+    def __init__(self, state, parent, action, depth=0):
+        super().__init__(state, parent, action)
+        self.depth = depth
+        self.parents = [] if parent is None else [(parent, action)]
+
+    def add_parent(self, parent, action):
+        self.parents.append((parent, action))
+
+
+class SearchMetrics():
+    """
+    Records how a search runs: people or cells expanded, the peak
+    frontier size, and the expansions and time spent at each depth.
+    Searches take an optional metrics argument and only call it when
+    one is given, so a search without metrics pays nothing.
+    Peak traced memory is recorded too when track_memory is set;
+    it uses tracemalloc, which slows the search down considerably.
+    """
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.expanded = 0
+        self.frontier_peak = 0
+        self.depths = {}
+        self.layers = {}
+        self.seconds = 0.0
+        self.memory_peak = None
+        self.started = None
+        self.last = None
+        self.depth = None
+
+    def start(self):
+        if self.track_memory:
+            tracemalloc.start()
+        self.started = self.last = time.perf_counter()
+
+    def expand(self, depth, frontier_size):
+        """
+        Records one expansion at depth, with frontier_size
+        states still waiting in the frontier.
+        """
+        now = time.perf_counter()
+        # Time since the previous expansion is charged to its depth.
+        if self.depth is not None:
+            self.layers[self.depth]["seconds"] += now - self.last
+        self.last = now
+        self.depth = depth
+        if depth not in self.layers:
+            self.layers[depth] = {"expanded": 0, "seconds": 0.0}
+        self.layers[depth]["expanded"] += 1
+        self.expanded += 1
+        self.frontier_peak = max(self.frontier_peak, frontier_size)
+
+    def expand_node(self, node, frontier_size):
+        """
+        Like expand, working out the depth of a Node from its parent.
+        """
+        if node.parent is None:
+            depth = 0
+        else:
+            depth = self.depths.get(node.parent.state, 0) + 1
+        self.depths[node.state] = depth
+        self.expand(depth, frontier_size)
+
+    def stop(self):
+        now = time.perf_counter()
+        if self.depth is not None:
+            self.layers[self.depth]["seconds"] += now - self.last
+        self.seconds = now - self.started
+        if self.track_memory:
+            self.memory_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def summary(self):
+        return {
+            "expanded": self.expanded,
+            "frontier_peak": self.frontier_peak,
+            "seconds": self.seconds,
+            "memory_peak": self.memory_peak,
+            "layers": [dict(depth=depth, **layer) for depth, layer in sorted(self.layers.items())],
+        }
+
+    def export(self, filename):
+        """
+        Writes the summary as JSON, or one row per depth as CSV
+        if filename ends in .csv.
+        """
+        summary = self.summary()
+        with open(filename, "w", newline="") as f:
+            if filename.endswith(".csv"):
+                writer = csv.DictWriter(f, ["depth", "expanded", "seconds"])
+                writer.writeheader()
+                writer.writerows(summary["layers"])
+            else:
+                json.dump(summary, f, indent=2)
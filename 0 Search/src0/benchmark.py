@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from generate import STYLES, generate, write_maze
+from maze import SOLVERS, Maze
+
+USAGE = ("Usage: python benchmark.py [--csv results.csv] maze.txt ... [STYLE:SIZE ...]\n"
+         f"       STYLE is one of {', '.join(STYLES)}; SIZE is N or HxW, optionally :SEED")
+FIELDS = ["maze", "solver", "explored", "length", "seconds", "peak_kb"]
+
+
+def main():
+    args = sys.argv[1:]
+    output = None
+    if args[:1] == ["--csv"] and len(args) > 1:
+        output = args[1]
+        args = args[2:]
+    if not args:
+        sys.exit(USAGE)
+
+    results = []
+    print(f"{'maze':<24}{'solver':<8}{'explored':>10}{'length':>8}{'seconds':>10}{'peak_kb':>10}")
+    for name in args:
+        filename = name if os.path.exists(name) else write_generated(*parse_spec(name))
+        try:
+            for solver in SOLVERS:
+                result = run(filename, solver)
+                result["maze"] = name
+                results.append(result)
+                length = "-" if result["length"] is None else result["length"]
+                print(f"{name:<24}{solver:<8}{result['explored']:>10}{length:>8}"
+                      f"{result['seconds']:>10.4f}{result['peak_kb']:>10}")
+        finally:
+            if filename != name:
+                os.remove(filename)
+
+    if output is not None:
+        with open(output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+
+
+def run(filename, solver):
+    """
+    Solves the maze in filename with solver and returns the number of
+    states explored, the path length (None without a solution), the
+    solving time and the peak memory allocated while solving. The time
+    comes from a run without tracemalloc, which slows allocation down.
+    """
+    m = Maze(filename)
+    start = time.perf_counter()
+    try:
+        m.solve(solver=solver)
+        length = len(m.solution[0])
+    except Exception:
+        length = None
+    seconds = time.perf_counter() - start
+
+    m = Maze(filename)
+    tracemalloc.start()
+    try:
+        m.solve(solver=solver)
+    except Exception:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "solver": solver,
+        "explored": m.num_explored,
+        "length": length,
+        "seconds": round(seconds, 4),
+        "peak_kb": peak // 1024,
+    }
+
+
+def parse_spec(spec):
+    """
+    Parses STYLE:SIZE, STYLE:HxW or STYLE:HxW:SEED into
+    (style, height, width, seed).
+    """
+    parts = spec.split(":")
+    if len(parts) not in [2, 3] or parts[0] not in STYLES:
+        sys.exit(USAGE)
+    height, _, width = parts[1].partition("x")
+    seed = int(parts[2]) if len(parts) == 3 else 0
+    return parts[0], int(height), int(width or height), seed
+
+
+def write_generated(style, height, width, seed=0, density=0.2):
+    """
+    Writes a generated maze to a temporary file and returns its name.
+    """
+    fd, filename = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    write_maze(generate(style, height, width, seed, density), filename)
+    return filename
+
+
+def write_open_room(size, density=0.2, seed=0):
+    """
+    Writes a size x size room with randomly scattered walls, start in
+    the top left and goal in the bottom right corner, to a temporary
+    file and returns its name.
+    """
+    return write_generated("open", size, size, seed, density)
+
+
+if __name__ == "__main__":
+    main()
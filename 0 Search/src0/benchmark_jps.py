@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import os
+import random
+import sys
+import time
+
+from benchmark import write_open_room
+from maze import Maze
+
+
+def check(count, seed=0):
+    """
+    Solves count random mazes with BFS and jump point search and checks
+    that both find paths of the same length, and that every jump point
+    path is a valid walk from start to goal. Start and goal are moved to
+    random open cells, so paths run in every direction, not just from
+    the top left to the bottom right. Returns the mismatches.
+    """
+    rng = random.Random(seed)
+    moves = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+    failures = []
+    for i in range(count):
+        size = rng.randint(2, 40)
+        density = rng.choice([0.0, 0.1, 0.2, 0.3, 0.4])
+        filename = write_open_room(size, density, seed=i)
+        try:
+            m = Maze(filename)
+            open_cells = list(zip(*(~m.walls).nonzero()))
+            start, goal = (tuple(int(x) for x in rng.choice(open_cells)) for _ in range(2))
+            lengths = []
+            for solver in ["bfs", "jps"]:
+                m = Maze(filename)
+                m.start = start
+                m.goal = goal
+                m.goals = [goal]
+                try:
+                    m.solve(solver=solver)
+                except Exception:
+                    lengths.append(None)
+                    continue
+                lengths.append(len(m.solution[0]))
+                row, col = m.start
+                for action, cell in zip(*m.solution):
+                    row, col = row + moves[action][0], col + moves[action][1]
+                    if (row, col) != cell or m.walls[row][col]:
+                        failures.append((size, density, i, start, goal, solver, "invalid path"))
+                        break
+                else:
+                    if (row, col) != goal:
+                        failures.append((size, density, i, start, goal, solver, "misses goal"))
+            if lengths[0] != lengths[1]:
+                failures.append((size, density, i, start, goal, "lengths", lengths))
+        finally:
+            os.remove(filename)
+    return failures
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark_jps.py [random mazes]")
+    count = int(sys.argv[1]) if len(sys.argv) == 2 else 500
+
+    failures = check(count)
+    print(f"Checked {count} random mazes against BFS: {len(failures)} mismatches")
+    for failure in failures:
+        print("Mismatch:", failure)
+
+    print(f"{'room':<16}{'solver':<8}{'explored':>10}{'seconds':>10}")
+    for size, density in [(200, 0.0), (500, 0.0), (500, 0.05), (1000, 0.02)]:
+        filename = write_open_room(size, density)
+        try:
+            for solver in ["bfs", "astar", "jps"]:
+                m = Maze(filename)
+                start = time.perf_counter()
+                m.solve(solver=solver)
+                seconds = time.perf_counter() - start
+                room = f"{size}x{size} {density:.0%}"
+                print(f"{room:<16}{solver:<8}{m.num_explored:>10}{seconds:>10.4f}")
+        finally:
+            os.remove(filename)
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
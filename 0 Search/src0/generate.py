@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+import random
+import sys
+
+STYLES = ["backtracker", "prim", "open"]
+
+WALL = ord("#")
+OPEN = ord(" ")
+
+
+def backtracker(rows, cols, rng):
+    """
+    Returns a perfect maze of rows x cols rooms carved by an iterative
+    recursive backtracker, as a list of bytearray lines of
+    (2 * rows + 1) x (2 * cols + 1) characters.
+    """
+    grid = [bytearray([WALL]) * (2 * cols + 1) for _ in range(2 * rows + 1)]
+    visited = bytearray(rows * cols)
+    stack = [(0, 0)]
+    visited[0] = 1
+    grid[1][1] = OPEN
+    while stack:
+        row, col = stack[-1]
+        options = [
+            (r, c) for r, c in [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]
+            if 0 <= r < rows and 0 <= c < cols and not visited[r * cols + c]
+        ]
+        if not options:
+            stack.pop()
+            continue
+        r, c = rng.choice(options)
+        visited[r * cols + c] = 1
+        grid[row + r + 1][col + c + 1] = OPEN
+        grid[2 * r + 1][2 * c + 1] = OPEN
+        stack.append((r, c))
+    return grid
+
+
+def prim(rows, cols, rng):
+    """
+    Returns a perfect maze of rows x cols rooms grown with randomized
+    Prim's algorithm, in the same form as backtracker.
+    """
+    grid = [bytearray([WALL]) * (2 * cols + 1) for _ in range(2 * rows + 1)]
+    # 0: not in maze, 1: on the frontier, 2: in maze
+    state = bytearray(rows * cols)
+    frontier = []
+
+    def add(row, col):
+        state[row * cols + col] = 2
+        grid[2 * row + 1][2 * col + 1] = OPEN
+        for r, c in [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]:
+            if 0 <= r < rows and 0 <= c < cols and not state[r * cols + c]:
+                state[r * cols + c] = 1
+                frontier.append((r, c))
+
+    add(0, 0)
+    while frontier:
+        # Swap a random frontier room to the end so removal is O(1)
+        i = rng.randrange(len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        row, col = frontier.pop()
+        inside = [
+            (r, c) for r, c in [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]
+            if 0 <= r < rows and 0 <= c < cols and state[r * cols + c] == 2
+        ]
+        r, c = rng.choice(inside)
+        grid[row + r + 1][col + c + 1] = OPEN
+        add(row, col)
+    return grid
+
+
+def open_room(height, width, rng, density=0.2):
+    """
+    Returns a height x width room with a share of density cells
+    turned into walls at random.
+    """
+    grid = []
+    for _ in range(height):
+        grid.append(bytearray(WALL if rng.random() < density else OPEN for _ in range(width)))
+    return grid
+
+
+def generate(style, height, width, seed=0, density=0.2):
+    """
+    Returns a maze of about height x width characters as a list of
+    bytearray lines, with the start A in the top left and the goal B
+    in the bottom right. The same arguments give the same maze.
+    """
+    rng = random.Random(seed)
+    if style == "open":
+        grid = open_room(height, width, rng, density)
+        start = (0, 0)
+        goal = (height - 1, width - 1)
+    elif style in ["backtracker", "prim"]:
+        carve = backtracker if style == "backtracker" else prim
+        grid = carve(max(1, (height - 1) // 2), max(1, (width - 1) // 2), rng)
+        start = (1, 1)
+        goal = (len(grid) - 2, len(grid[0]) - 2)
+    else:
+        raise ValueError(f"unknown style: {style}")
+    grid[start[0]][start[1]] = ord("A")
+    grid[goal[0]][goal[1]] = ord("B")
+    return grid
+
+
+def write_maze(grid, filename):
+    with open(filename, "wb") as f:
+        for line in grid:
+            f.write(line)
+            f.write(b"\n")
+
+
+def main():
+    if len(sys.argv) not in [5, 6]:
+        sys.exit(f"Usage: python generate.py {'|'.join(STYLES)} HEIGHT WIDTH output.txt [seed]")
+    style = sys.argv[1]
+    height = int(sys.argv[2])
+    width = int(sys.argv[3])
+    seed = int(sys.argv[5]) if len(sys.argv) == 6 else 0
+
+    write_maze(generate(style, height, width, seed), sys.argv[4])
+
+
+if __name__ == "__main__":
+    main()
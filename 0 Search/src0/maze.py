@@ -1,229 +1,754 @@
+import csv
+import heapq
+import itertools
+import json
 import sys
-
-class Node():
-    def __init__(self, state, parent, action):
-        self.state = state
-        self.parent = parent
-        self.action = action
-
-
-class StackFrontier():
-    def __init__(self):
-        self.frontier = []
-
-    def add(self, node):
-        self.frontier.append(node)
+import time
+import tracemalloc
+from array import array
+from collections import OrderedDict, deque
+
+import numpy
+
+
+class PriorityFrontier():
+    """
+    Frontier of states that removes the state with the lowest
+    priority(state) first, backed by a binary heap. Adding a state that
+    is already in the frontier with a lower priority updates it
+    (decrease-key); the old heap entry is left in place and skipped when
+    it comes out (lazy deletion).
+    """
+    def __init__(self, priority):
+        self.priority = priority
+        self.heap = []
+        self.priorities = {}
+        # Tie-breaker so equal priorities come out in insertion order
+        self.counter = itertools.count()
+
+    def add(self, state):
+        priority = self.priority(state)
+        self.priorities[state] = priority
+        heapq.heappush(self.heap, (priority, next(self.counter), state))
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.priorities
 
     def empty(self):
-        return len(self.frontier) == 0
-
-    def remove(self):
-        if self.empty():
-            raise Exception("empty frontier")
-        else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
-            return node
+        return len(self.priorities) == 0
 
-
-class QueueFrontier(StackFrontier):
+    def __len__(self):
+        return len(self.priorities)
 
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
-        else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
+        while True:
+            priority, _, state = heapq.heappop(self.heap)
+            if self.priorities.get(state) == priority:
+                del self.priorities[state]
+                return state
+
+
+class SearchMetrics():
+    """
+    Records how a search runs: cells expanded, the peak
+    frontier size, and the expansions and time spent at each depth.
+    Searches take an optional metrics argument and only call it when
+    one is given, so a search without metrics pays nothing.
+    Peak traced memory is recorded too when track_memory is set;
+    it uses tracemalloc, which slows the search down considerably.
+    """
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.expanded = 0
+        self.frontier_peak = 0
+        self.layers = {}
+        self.seconds = 0.0
+        self.memory_peak = None
+        self.started = None
+        self.last = None
+        self.depth = None
+
+    def start(self):
+        if self.track_memory:
+            tracemalloc.start()
+        self.started = self.last = time.perf_counter()
+
+    def expand(self, depth, frontier_size, count=1):
+        """
+        Records count expansions at depth (one unless a whole layer is
+        expanded at once), with frontier_size states still waiting
+        in the frontier.
+        """
+        now = time.perf_counter()
+        # Time since the previous expansion is charged to its depth.
+        if self.depth is not None:
+            self.layers[self.depth]["seconds"] += now - self.last
+        self.last = now
+        self.depth = depth
+        if depth not in self.layers:
+            self.layers[depth] = {"expanded": 0, "seconds": 0.0}
+        self.layers[depth]["expanded"] += count
+        self.expanded += count
+        self.frontier_peak = max(self.frontier_peak, frontier_size)
+
+    def stop(self):
+        now = time.perf_counter()
+        if self.depth is not None:
+            self.layers[self.depth]["seconds"] += now - self.last
+        self.seconds = now - self.started
+        if self.track_memory:
+            self.memory_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def summary(self):
+        return {
+            "expanded": self.expanded,
+            "frontier_peak": self.frontier_peak,
+            "seconds": self.seconds,
+            "memory_peak": self.memory_peak,
+            "layers": [dict(depth=depth, **layer) for depth, layer in sorted(self.layers.items())],
+        }
+
+    def export(self, filename):
+        """
+        Writes the summary as JSON, or one row per depth as CSV
+        if filename ends in .csv.
+        """
+        summary = self.summary()
+        with open(filename, "w", newline="") as f:
+            if filename.endswith(".csv"):
+                writer = csv.DictWriter(f, ["depth", "expanded", "seconds"])
+                writer.writeheader()
+                writer.writerows(summary["layers"])
+            else:
+                json.dump(summary, f, indent=2)
+
+
+SOLVERS = ["dfs", "bfs", "greedy", "astar", "field", "jps"]
+
+
+class TreeCache():
+    """
+    Least recently used cache of BFS trees keyed by their source cell,
+    holding at most capacity trees and at most max_bytes bytes of them.
+    One tree costs 4 bytes per cell, so on large mazes the byte budget
+    is what binds; the newest tree is kept even if it alone is over it.
+    Counts hits and misses.
+    """
+    def __init__(self, capacity=16, max_bytes=256 << 20):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.trees = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, source):
+        return source in self.trees
+
+    def __len__(self):
+        return len(self.trees)
+
+    def get(self, source):
+        tree = self.trees.get(source)
+        if tree is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.trees.move_to_end(source)
+        return tree
+
+    def put(self, source, tree):
+        old = self.trees.pop(source, None)
+        if old is not None:
+            self.bytes -= len(old) * old.itemsize
+        self.trees[source] = tree
+        self.bytes += len(tree) * tree.itemsize
+        while len(self.trees) > self.capacity \
+                or (len(self.trees) > 1 and self.bytes > self.max_bytes):
+            _, evicted = self.trees.popitem(last=False)
+            self.bytes -= len(evicted) * evicted.itemsize
+
+    def memory(self):
+        """Returns the bytes held by the cached trees."""
+        return self.bytes
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        return {
+            "trees": len(self.trees),
+            "capacity": self.capacity,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "bytes": self.memory(),
+        }
+
 
 class Maze():
 
-    def __init__(self, filename):
+    def __init__(self, filename, cache_size=16, cache_bytes=256 << 20):
 
-        # Read file and set height and width of maze
+        # Stream the file row by row, keeping track of walls as one
+        # boolean array per row and validating start and goal as we go
+        rows = []
+        self.start = None
+        self.goals = []
         with open(filename) as f:
-            contents = f.read()
-
-        # Validate start and goal
-        if contents.count("A") != 1:
+            for i, line in enumerate(f):
+                line = line.rstrip("\r\n")
+                codes = numpy.frombuffer(line.encode("utf-32-le"), dtype=numpy.uint32)
+                rows.append((codes != ord(" ")) & (codes != ord("A")) & (codes != ord("B")))
+                if "A" in line:
+                    if self.start is not None or line.count("A") > 1:
+                        raise Exception("maze must have exactly one start point")
+                    self.start = (i, line.index("A"))
+                j = line.find("B")
+                while j != -1:
+                    self.goals.append((i, j))
+                    j = line.find("B", j + 1)
+        if self.start is None:
             raise Exception("maze must have exactly one start point")
-        if contents.count("B") != 1:
-            raise Exception("maze must have exactly one goal")
-
-        # Determine height and width of maze
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-
-        # Keep track of walls
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
+        if not self.goals:
+            raise Exception("maze must have at least one goal")
 
-        self.solution = None
+        # solve searches for the first goal; solve_goals finds them all
+        self.goal = self.goals[0]
 
+        # Determine height and width of maze; cells past the
+        # end of a short line are open
+        self.height = len(rows)
+        self.width = max(len(row) for row in rows)
+        self.walls = numpy.zeros((self.height, self.width), dtype=bool)
+        for i, row in enumerate(rows):
+            self.walls[i, :len(row)] = row
 
-    def print(self):
-        solution = self.solution[1] if self.solution is not None else None
-        print()
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col:
-                    print("█", end="")
-                elif (i, j) == self.start:
-                    print("A", end="")
-                elif (i, j) == self.goal:
-                    print("B", end="")
-                elif solution is not None and (i, j) in solution:
-                    print("*", end="")
-                else:
-                    print(" ", end="")
-            print()
-        print()
+        self.index_cells()
+        self.solution = None
+        self.explored = None
+        self.trees = TreeCache(cache_size, cache_bytes)
+
+
+    def index_cells(self):
+        """
+        Numbers cells as flat ints on a grid padded with one ring of
+        wall, so each move is a fixed offset and needs no bounds check.
+        self.cells[state] is 1 for open cells.
+        """
+        self.stride = self.width + 2
+        padded = numpy.zeros((self.height + 2, self.width + 2), dtype=numpy.uint8)
+        padded[1:-1, 1:-1] = ~self.walls
+        self.cells = padded.tobytes()
+        self.offsets = [
+            ("up", -self.stride),
+            ("down", self.stride),
+            ("left", -1),
+            ("right", 1)
+        ]
 
 
-    def neighbors(self, state):
+    def encode(self, state):
         row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1))
-        ]
+        return (row + 1) * self.stride + col + 1
+
+
+    def decode(self, state):
+        row, col = divmod(state, self.stride)
+        return (row - 1, col - 1)
 
-        result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
-                result.append((action, (r, c)))
-        return result
 
+    def print(self):
+        # Fill a character grid in bulk, then print it a line at a time
+        chars = numpy.full((self.height, self.width), " ", dtype="<U1")
+        chars[self.walls] = "█"
+        if self.solution is not None and self.solution[1]:
+            chars[self.cell_index(self.solution[1])] = "*"
+        chars[self.start] = "A"
+        chars[self.cell_index(self.goals)] = "B"
+        print()
+        # View each row as one string, so only one line is built at a time
+        for line in chars.view(f"<U{self.width}").ravel():
+            print(line)
+        print()
 
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+
+    def heuristic(self, state):
+        """Manhattan distance from flat state to the goal."""
+        row, col = self.decode(state)
+        return abs(row - self.goal[0]) + abs(col - self.goal[1])
+
+
+    def frontier(self, solver, cost):
+        if solver == "greedy":
+            return PriorityFrontier(self.heuristic)
+        if solver == "astar":
+            # Among equal f = g + h, prefer the state closer to the goal.
+            def priority(state):
+                h = self.heuristic(state)
+                return cost[state] + h, h
+            return PriorityFrontier(priority)
+        raise ValueError(f"unknown solver: {solver}")
+
+
+    def solve(self, metrics=None, solver="dfs"):
+        """
+        Finds a solution to maze, if one exists.
+        solver is one of SOLVERS: depth-first, breadth-first, greedy
+        best-first or A* search (the last two guided by the Manhattan
+        distance to the goal), the vectorized BFS of solve_field, or
+        the jump point search of solve_jps.
+        If given, metrics (a SearchMetrics) records every expansion.
+
+        States are flat cell numbers, and parents, path costs and
+        explored marks live in arrays with one slot per cell, so memory
+        use is fixed by the maze size. self.explored is left as a
+        height x width boolean mask of the explored cells.
+        """
+        if solver not in SOLVERS:
+            raise ValueError(f"unknown solver: {solver}")
+        if solver == "field":
+            return self.solve_field(metrics)
+        if solver == "jps":
+            return self.solve_jps(metrics)
 
         # Keep track of number of states explored
         self.num_explored = 0
 
-        # Initialize frontier to just the starting position
-        start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
-        frontier.add(start)
+        cells = self.cells
+        offsets = [offset for _, offset in self.offsets]
+        parent = array("i", [-1]) * len(cells)
+        cost = array("i", [0]) * len(cells)
+        # 0: not reached, 1: in frontier, 2: explored
+        marks = bytearray(len(cells))
+        start = self.encode(self.start)
+        goal = self.encode(self.goal)
 
-        # Initialize an empty explored set
-        self.explored = set()
+        # Initialize frontier to just the starting position
+        if solver in ["dfs", "bfs"]:
+            frontier = deque()
+            add = frontier.append
+            remove = frontier.pop if solver == "dfs" else frontier.popleft
+        else:
+            frontier = self.frontier(solver, cost)
+            add = frontier.add
+            remove = frontier.remove
+        add(start)
+        marks[start] = 1
 
         # Keep looping until solution found
         while True:
 
             # If nothing left in frontier, then no path
-            if frontier.empty():
+            if not frontier:
+                self.explored = self.explored_mask(marks)
                 raise Exception("no solution")
 
-            # Choose a node from the frontier
-            node = frontier.remove()
+            # Choose a state from the frontier
+            state = remove()
             self.num_explored += 1
+            if metrics is not None:
+                metrics.expand(cost[state], len(frontier))
 
-            # If node is the goal, then we have a solution
-            if node.state == self.goal:
-                actions = []
-                cells = []
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
+            # If state is the goal, then we have a solution
+            if state == goal:
+                self.explored = self.explored_mask(marks)
+                self.solution = self.trace(parent, start, goal)
                 return
 
-            # Mark node as explored
-            self.explored.add(node.state)
+            # Mark state as explored
+            marks[state] = 2
 
             # Add neighbors to frontier
-            for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
-                    frontier.add(child)
-
-
-    def output_image(self, filename, show_solution=True, show_explored=False):
-        from PIL import Image, ImageDraw
-        cell_size = 50
-        cell_border = 2
-
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
-
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
-
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
-
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
-
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
-
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
-
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
-
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
-
-        img.save(filename)
-
-
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
-
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
+            new_cost = cost[state] + 1
+            for offset in offsets:
+                neighbor = state + offset
+                if not cells[neighbor] or marks[neighbor] == 2:
+                    continue
+                # A* updates a frontier state when it finds a cheaper way
+                # to it; the other solvers keep the first one.
+                if marks[neighbor] == 1 \
+                        and (solver != "astar" or new_cost >= cost[neighbor]):
+                    continue
+                parent[neighbor] = state
+                cost[neighbor] = new_cost
+                marks[neighbor] = 1
+                add(neighbor)
+
+
+    def distance_field(self, stop_at_goal=True):
+        """
+        Returns a height x width array of BFS distances from the start,
+        -1 for cells not reached.
+
+        Each layer is computed at once with NumPy: the flat cell numbers
+        of the frontier are shifted by every move offset, filtered by an
+        unreached mask over the padded grid, and deduplicated. Work per
+        layer follows the frontier size rather than the maze size. Stops
+        after the goal's layer unless stop_at_goal is False.
+        """
+        unreached = numpy.frombuffer(self.cells, dtype=numpy.uint8).astype(bool)
+        distances = numpy.full(len(self.cells), -1, dtype=numpy.int32)
+        offsets = numpy.array([offset for _, offset in self.offsets])
+        goal = self.encode(self.goal)
+
+        frontier = numpy.array([self.encode(self.start)])
+        unreached[frontier] = False
+        distances[frontier] = 0
+        depth = 0
+
+        while len(frontier) and not (stop_at_goal and distances[goal] != -1):
+            grown = (frontier[:, None] + offsets).ravel()
+            grown = numpy.unique(grown[unreached[grown]])
+            depth += 1
+            unreached[grown] = False
+            distances[grown] = depth
+            frontier = grown
+
+        return distances.reshape(self.height + 2, self.stride)[1:-1, 1:-1]
+
+
+    def solve_field(self, metrics=None):
+        """
+        Finds a solution to maze with the vectorized BFS distance field,
+        then walks back from the goal to a neighbor one step closer to
+        the start until it reaches the start. Sets self.solution and
+        self.explored like solve; explored holds every cell of the
+        layers before the goal's.
+        """
+        distances = self.distance_field()
+        goal_distance = distances[self.goal]
+
+        if goal_distance == -1:
+            self.explored = distances >= 0
+        else:
+            self.explored = (distances >= 0) & (distances < goal_distance)
+        self.num_explored = int(numpy.count_nonzero(self.explored))
+        if metrics is not None:
+            layers = numpy.bincount(distances[distances >= 0])
+            for depth, count in enumerate(layers.tolist()):
+                metrics.expand(depth, count, count)
+
+        if goal_distance == -1:
+            raise Exception("no solution")
+
+        moves = [("up", (-1, 0)), ("down", (1, 0)), ("left", (0, -1)), ("right", (0, 1))]
+        actions = []
+        cells = []
+        row, col = self.goal
+        while (row, col) != self.start:
+            for action, (dr, dc) in moves:
+                # The previous cell is the neighbor one step closer,
+                # reached from it by moving in the direction of action.
+                r, c = row - dr, col - dc
+                if 0 <= r < self.height and 0 <= c < self.width \
+                        and distances[r, c] == distances[row, col] - 1:
+                    actions.append(action)
+                    cells.append((row, col))
+                    row, col = r, c
+                    break
+        actions.reverse()
+        cells.reverse()
+        self.solution = (actions, cells)
+
+
+    def jump(self, state, step, goal):
+        """
+        Moves from state in the direction of step (a move offset) until
+        it reaches a jump point, and returns it, or None on hitting a
+        wall. A jump point is the goal, or a cell with a forced neighbor:
+        an open cell to the side whose cell one step back is a wall.
+        Vertical jumps also stop where a horizontal jump would find one.
+        """
+        cells = self.cells
+        horizontal = step in [1, -1]
+        side = self.stride if horizontal else 1
+        state += step
+        while cells[state]:
+            if state == goal:
+                return state
+            if (cells[state - side] and not cells[state - step - side]) \
+                    or (cells[state + side] and not cells[state - step + side]):
+                return state
+            if not horizontal and (self.jump(state, 1, goal) is not None
+                                   or self.jump(state, -1, goal) is not None):
+                return state
+            state += step
+        return None
+
+
+    def jump_directions(self, state, parent):
+        """
+        Returns the move offsets worth trying from state when it was
+        reached from parent: straight on and both sides. The start has
+        no parent and tries all four.
+        """
+        if parent is None:
+            return [offset for _, offset in self.offsets]
+        if state // self.stride == parent // self.stride:
+            step = 1 if state > parent else -1
+            side = self.stride
+        else:
+            step = self.stride if state > parent else -self.stride
+            side = 1
+        return [step, side, -side]
+
+
+    def solve_jps(self, metrics=None):
+        """
+        Finds a shortest solution with jump point search: A* over jump
+        points only, pruning the symmetric paths of a uniform-cost
+        4-connected grid. Sets self.solution like solve; num_explored
+        and self.explored count the jump points expanded.
+        """
+        self.num_explored = 0
+        start = self.encode(self.start)
+        goal = self.encode(self.goal)
+        cost = {start: 0}
+        parent = {start: None}
+        frontier = self.frontier("astar", cost)
+        frontier.add(start)
+        explored = set()
+
+        while True:
+            if frontier.empty():
+                self.explored = self.explored_mask(explored)
+                raise Exception("no solution")
+
+            state = frontier.remove()
+            self.num_explored += 1
+            if metrics is not None:
+                metrics.expand(cost[state], len(frontier))
+
+            if state == goal:
+                self.explored = self.explored_mask(explored)
+                self.solution = self.trace_jumps(parent, goal)
+                return
+
+            explored.add(state)
+            for step in self.jump_directions(state, parent[state]):
+                point = self.jump(state, step, goal)
+                if point is None or point in explored:
+                    continue
+                row, col = divmod(state, self.stride)
+                point_row, point_col = divmod(point, self.stride)
+                new_cost = cost[state] + abs(row - point_row) + abs(col - point_col)
+                if point in cost and new_cost >= cost[point]:
+                    continue
+                cost[point] = new_cost
+                parent[point] = state
+                frontier.add(point)
+
+
+    def trace_jumps(self, parent, goal):
+        """
+        Returns (actions, cells) from the start to the goal, filling in
+        the straight runs of cells between consecutive jump points.
+        """
+        names = {offset: action for action, offset in self.offsets}
+        actions = []
+        cells = []
+        state = goal
+        while parent[state] is not None:
+            previous = parent[state]
+            if state // self.stride == previous // self.stride:
+                step = 1 if state > previous else -1
+            else:
+                step = self.stride if state > previous else -self.stride
+            while state != previous:
+                actions.append(names[step])
+                cells.append(self.decode(state))
+                state -= step
+        actions.reverse()
+        cells.reverse()
+        return (actions, cells)
+
+
+    def bfs_tree(self, source):
+        """
+        Returns the BFS tree of every cell reachable from the flat cell
+        source, as an array of parent cells (-1 where not reached, source
+        for itself). Trees are kept in self.trees, so later queries
+        from or to source reuse them.
+        """
+        parent = self.trees.get(source)
+        if parent is not None:
+            return parent
+
+        cells = self.cells
+        offsets = [offset for _, offset in self.offsets]
+        parent = array("i", [-1]) * len(cells)
+        parent[source] = source
+        frontier = deque([source])
+        while frontier:
+            state = frontier.popleft()
+            for offset in offsets:
+                neighbor = state + offset
+                if cells[neighbor] and parent[neighbor] == -1:
+                    parent[neighbor] = state
+                    frontier.append(neighbor)
+
+        self.trees.put(source, parent)
+        return parent
+
+
+    def query(self, start, goal):
+        """
+        Returns a shortest (actions, cells) path from the start cell to
+        the goal cell, both (row, col), or None if there is none.
+        Moves are reversible, so a cached tree rooted at either end
+        answers the query by walking parent links without a new search.
+        """
+        start = self.encode(start)
+        goal = self.encode(goal)
+        if not self.cells[start] or not self.cells[goal]:
+            return None
+        if goal in self.trees and start not in self.trees:
+            # Parent links in the tree of the goal lead from the start
+            # to the goal, so they can be followed forward.
+            parent = self.bfs_tree(goal)
+            if parent[start] == -1:
+                return None
+            names = {offset: action for action, offset in self.offsets}
+            actions = []
+            cells = []
+            state = start
+            while state != goal:
+                actions.append(names[parent[state] - state])
+                state = parent[state]
+                cells.append(self.decode(state))
+            return (actions, cells)
+
+        parent = self.bfs_tree(start)
+        if parent[goal] == -1:
+            return None
+        return self.trace(parent, start, goal)
+
+
+    def solve_many(self, pairs):
+        """
+        Returns the query result for every (start, goal) pair, in order.
+        """
+        return [self.query(start, goal) for start, goal in pairs]
+
+
+    def solve_goals(self):
+        """
+        Returns a dict mapping every goal to the shortest path from the
+        start to it, or None, using a single BFS tree. Also sets
+        self.solution to the path to the nearest reachable goal.
+        """
+        paths = {goal: self.query(self.start, goal) for goal in self.goals}
+        reachable = [path for path in paths.values() if path is not None]
+        if reachable:
+            self.solution = min(reachable, key=lambda path: len(path[0]))
+        return paths
+
+
+    def trace(self, parent, start, goal):
+        """
+        Returns (actions, cells) from the start to the goal
+        by following parent links back from the goal.
+        """
+        names = {offset: action for action, offset in self.offsets}
+        actions = []
+        cells = []
+        state = goal
+        while state != start:
+            actions.append(names[state - parent[state]])
+            cells.append(self.decode(state))
+            state = parent[state]
+        actions.reverse()
+        cells.reverse()
+        return (actions, cells)
+
+
+    def explored_mask(self, marks):
+        """
+        Returns a height x width boolean mask of the explored cells, from
+        a bytearray of marks with 2 for explored, or a set of flat cells.
+        """
+        if isinstance(marks, set):
+            flat = numpy.zeros(len(self.cells), dtype=bool)
+            flat[numpy.fromiter(marks, dtype=numpy.intp, count=len(marks))] = True
+        else:
+            flat = numpy.frombuffer(marks, dtype=numpy.uint8) == 2
+        return flat.reshape(self.height + 2, self.stride)[1:-1, 1:-1]
+
+
+    def cell_index(self, cells):
+        """Returns (rows, cols) index arrays for a collection of (row, col) cells."""
+        flat = numpy.fromiter(itertools.chain.from_iterable(cells), dtype=numpy.intp, count=2 * len(cells))
+        return (flat[0::2], flat[1::2])
+
+
+    def output_image(self, filename, show_solution=True, show_explored=False, cell_size=50):
+        from PIL import Image
+        cell_border = cell_size // 25
+
+        # Color one pixel per cell; later assignments take precedence
+        pixels = numpy.empty((self.height, self.width, 3), dtype=numpy.uint8)
+        pixels[:] = (237, 240, 252)
+        if self.solution is not None:
+
+            # Explored
+            if show_explored and self.explored is not None:
+                pixels[self.explored] = (212, 97, 85)
+
+            # Solution
+            if show_solution and self.solution[1]:
+                pixels[self.cell_index(self.solution[1])] = (220, 235, 113)
+
+        # Walls, start and goal
+        pixels[self.walls] = (40, 40, 40)
+        pixels[self.start] = (255, 0, 0)
+        pixels[self.cell_index(self.goals)] = (0, 171, 28)
+
+        # Scale every cell up to cell_size pixels at once,
+        # then blacken the border around each cell
+        pixels = pixels.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+        if cell_border:
+            inside = numpy.zeros(cell_size, dtype=bool)
+            inside[cell_border:cell_size - cell_border + 1] = True
+            pixels[~numpy.tile(inside, self.height)] = 0
+            pixels[:, ~numpy.tile(inside, self.width)] = 0
+
+        Image.fromarray(pixels, "RGB").save(filename)
+
+
+def main():
+    args = sys.argv[1:]
+    track_memory = "--memory" in args
+    if track_memory:
+        args.remove("--memory")
+    solver = "dfs"
+    if len(args) >= 2 and args[1] in SOLVERS:
+        solver = args.pop(1)
+    if len(args) not in [1, 2]:
+        sys.exit(f"Usage: python maze.py maze.txt [{'|'.join(SOLVERS)}] "
+                 "[metrics.json|metrics.csv] [--memory]")
+    metrics = SearchMetrics(track_memory) if len(args) == 2 or track_memory else None
+
+    m = Maze(args[0])
+    print("Maze:")
+    m.print()
+    print(f"Solving with {solver}...")
+    if metrics is not None:
+        metrics.start()
+    m.solve(metrics, solver)
+    if metrics is not None:
+        metrics.stop()
+        if len(args) == 2:
+            metrics.export(args[1])
+    print("States Explored:", m.num_explored)
+    if track_memory:
+        print(f"Peak Memory: {metrics.memory_peak / 1024:.1f} KiB")
+    print("Solution:")
+    m.print()
+    m.output_image("maze.png", show_explored=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import os
+import random
+import sys
+import time
+
+import morettt
+import mytttsum
+from bitboard import BitBoard
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "more"))
+import tictactoe9
+
+
+def class_search(ttt):
+    """
+    Returns a full minimax search over a TicTacToe class instance,
+    returning (value, nodes visited).
+    """
+    def search(board):
+        if ttt.terminal(board):
+            return ttt.utility(board), 1
+        values = []
+        nodes = 1
+        for action in ttt.actions(board):
+            value, count = search(ttt.result(board, action))
+            values.append(value)
+            nodes += count
+        return (max(values) if ttt.next_player(board) == "X" else min(values)), nodes
+    return search
+
+
+def tictactoe9_search(board):
+    board = [[None if cell == "-" else cell for cell in row] for row in board]
+
+    def search(board):
+        if tictactoe9.terminal(board):
+            return tictactoe9.utility(board), 1
+        values = []
+        nodes = 1
+        for action in tictactoe9.actions(board):
+            value, count = search(tictactoe9.result(board, action))
+            values.append(value)
+            nodes += count
+        return (max(values) if tictactoe9.player(board) == "X" else min(values)), nodes
+    return search(board)
+
+
+def bitboard_search(board):
+    bitboard = BitBoard.from_board(board)
+
+    def search():
+        if bitboard.terminal():
+            return bitboard.utility(), 1
+        values = []
+        nodes = 1
+        for cell in bitboard.actions():
+            bitboard.make(cell)
+            value, count = search()
+            bitboard.unmake(cell)
+            values.append(value)
+            nodes += count
+        return (max(values) if bitboard.x_to_move else min(values)), nodes
+    return search()
+
+
+ENGINES = {
+    # myttt imports morettt, which imports myttt, so myttt can only be
+    # loaded through morettt
+    "myttt": class_search(morettt.TicTacToe()),
+    "mytttsum": class_search(mytttsum.TicTacToe()),
+    "tictactoe9": tictactoe9_search,
+    "bitboard": bitboard_search,
+}
+
+
+def openings(plies, count, seed=0):
+    """
+    Returns count boards reached by plies random moves from the empty
+    board, stopping early if the game ends.
+    """
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        bitboard = BitBoard()
+        for _ in range(plies):
+            if bitboard.terminal():
+                break
+            bitboard.make(rng.choice(bitboard.actions()))
+        boards.append(bitboard.to_board())
+    return boards
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python benchmark_bitboard.py [plies] [positions]")
+    plies = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    boards = openings(plies, count)
+
+    print(f"Full minimax from {count} positions after {plies} random moves")
+    print(f"{'engine':<12}{'nodes':>10}{'seconds':>10}{'nodes/s':>12}")
+    expected = None
+    for name, search in ENGINES.items():
+        start = time.perf_counter()
+        results = [search(board) for board in boards]
+        seconds = time.perf_counter() - start
+        if expected is None:
+            expected = results
+        elif results != expected:
+            sys.exit(f"{name} disagrees with {next(iter(ENGINES))}")
+        nodes = sum(count for _, count in results)
+        print(f"{name:<12}{nodes:>10}{seconds:>10.3f}{nodes / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+import time
+
+import morettt
+
+
+def main():
+    board = [["-", "-", "-"], ["-", "-", "-"], ["-", "-", "-"]]
+
+    print("Solving the empty board with a cold transposition table")
+    print(f"{'keys':<12}{'positions':>10}{'lookups':>10}{'seconds':>10}")
+    searched = {}
+    for symmetric in [False, True]:
+        morettt.table.clear()
+        start = time.perf_counter()
+        morettt.minimax(board, symmetric)
+        seconds = time.perf_counter() - start
+        table = morettt.table
+        searched[symmetric] = table.misses
+        name = "canonical" if symmetric else "plain"
+        print(f"{name:<12}{table.misses:>10}{table.hits + table.misses:>10}{seconds:>10.3f}")
+    print(f"Symmetry searches {searched[False] / searched[True]:.1f}x fewer positions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Tic Tac Toe on bitboards.
+
+Each player's marks are a 9-bit int, bit 3 * i + j standing for the
+cell (i, j), and a flag says whose turn it is. Moves set and clear one
+bit in place instead of copying the board, and a player has won when
+their marks AND one of the eight line masks gives back the whole line.
+"""
+
+X = "X"
+O = "O"
+EMPTY = "-"
+
+FULL = 0b111111111
+
+LINES = [0b000000111, 0b000111000, 0b111000000,   # rows
+         0b001001001, 0b010010010, 0b100100100,   # columns
+         0b100010001, 0b001010100]                # diagonals
+
+# WINNING[marks] is 1 if marks hold a whole line, so win detection
+# is one lookup instead of eight masks per call
+WINNING = bytes(any(marks & line == line for line in LINES) for marks in range(FULL + 1))
+
+
+class BitBoard:
+    def __init__(self, x=0, o=0, x_to_move=True):
+        self.x = x
+        self.o = o
+        self.x_to_move = x_to_move
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        Returns the BitBoard of a list-of-lists board. Cells other than
+        "X" and "O" are empty, so both "-" and None boards work.
+        """
+        x = o = 0
+        for i, row in enumerate(board):
+            for j, cell in enumerate(row):
+                if cell == X:
+                    x |= 1 << (3 * i + j)
+                elif cell == O:
+                    o |= 1 << (3 * i + j)
+        return cls(x, o, bin(x).count("1") <= bin(o).count("1"))
+
+    def to_board(self, empty=EMPTY):
+        """
+        Returns the board as a list of lists, like TicTacToe.board.
+        """
+        board = []
+        for i in range(3):
+            row = []
+            for j in range(3):
+                bit = 1 << (3 * i + j)
+                row.append(X if self.x & bit else O if self.o & bit else empty)
+            board.append(row)
+        return board
+
+    def key(self):
+        """
+        Returns a single int that identifies the position.
+        """
+        return self.x << 9 | self.o
+
+    def player(self):
+        return X if self.x_to_move else O
+
+    def actions(self):
+        """
+        Returns the list of empty cells as bit numbers 0 to 8.
+        """
+        empty = FULL & ~(self.x | self.o)
+        return [cell for cell in range(9) if empty >> cell & 1]
+
+    def make(self, cell):
+        """
+        Puts the mark of the player to move on cell and passes the turn.
+        """
+        if (self.x | self.o) >> cell & 1:
+            raise ValueError
+        if self.x_to_move:
+            self.x |= 1 << cell
+        else:
+            self.o |= 1 << cell
+        self.x_to_move = not self.x_to_move
+
+    def unmake(self, cell):
+        """
+        Takes back the move on cell made by make.
+        """
+        self.x_to_move = not self.x_to_move
+        if self.x_to_move:
+            self.x &= ~(1 << cell)
+        else:
+            self.o &= ~(1 << cell)
+
+    def winner(self):
+        if WINNING[self.x]:
+            return X
+        if WINNING[self.o]:
+            return O
+        return None
+
+    def terminal(self):
+        return WINNING[self.x] or WINNING[self.o] or self.x | self.o == FULL
+
+    def utility(self):
+        if WINNING[self.x]:
+            return 1
+        if WINNING[self.o]:
+            return -1
+        return 0
+
+
+def solve(bitboard, cache=None):
+    """
+    Returns (value, best cell) for the bitboard, with no cell once the
+    game is over. Searches by making and unmaking moves on the one
+    bitboard. Values are remembered in cache, a dict keyed by
+    BitBoard.key, when given.
+    """
+    if cache is not None:
+        entry = cache.get(bitboard.key())
+        if entry is not None:
+            return entry
+
+    if bitboard.terminal():
+        entry = (bitboard.utility(), None)
+    else:
+        x_to_move = bitboard.x_to_move
+        win = 1 if x_to_move else -1
+        best_value = None
+        best_cell = None
+        for cell in bitboard.actions():
+            bitboard.make(cell)
+            value = solve(bitboard, cache)[0]
+            bitboard.unmake(cell)
+            if best_value is None \
+                    or (x_to_move and value > best_value) \
+                    or (not x_to_move and value < best_value):
+                best_value = value
+                best_cell = cell
+                if best_value == win:
+                    break
+        entry = (best_value, best_cell)
+
+    if cache is not None:
+        cache[bitboard.key()] = entry
+    return entry
+
+
+cache = {}
+
+
+def minimax(board):
+    """
+    Returns the optimal action (i, j) for the current player on a
+    list-of-lists board, like morettt.minimax.
+    """
+    bitboard = BitBoard.from_board(board)
+    if bitboard.terminal():
+        return None
+    return divmod(solve(bitboard, cache)[1], 3)
+
+
+class BitTicTacToe:
+    """
+    The board methods of myttt.TicTacToe on list-of-lists boards,
+    answered with bitboards.
+    """
+    def next_player(self, board):
+        return BitBoard.from_board(board).player()
+
+    def terminal(self, board):
+        return bool(BitBoard.from_board(board).terminal())
+
+    def utility(self, board):
+        return BitBoard.from_board(board).utility()
+
+    def actions(self, board):
+        return {divmod(cell, 3) for cell in BitBoard.from_board(board).actions()}
+
+    def winner(self, board):
+        return BitBoard.from_board(board).winner()
+
+    def result(self, board, move):
+        bitboard = BitBoard.from_board(board)
+        bitboard.make(3 * move[0] + move[1])
+        return bitboard.to_board()
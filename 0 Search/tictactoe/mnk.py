@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+m,n,k-games: two players take turns marking an m x n board and the
+first to get k in a row (across, down or diagonally) wins. Tic-tac-toe
+is the 3,3,3-game and gomoku the 15,15,5-game.
+
+The AI searches with iterative-deepening alpha-beta under a time budget
+per move, orders moves with killer moves and the history heuristic, and
+scores the positions where it stops with a pluggable evaluation.
+"""
+import sys
+import time
+
+EMPTY = 0
+X = 1
+O = 2
+MARKS = {EMPTY: "-", X: "X", O: "O"}
+
+WIN = 1000000000
+
+
+class MNKBoard:
+    """
+    An m x n board with cells numbered n * i + j, kept as a bytearray
+    of EMPTY, X and O.
+
+    Every run of k cells in a row is a window. Making a move updates the
+    marks each player has in the windows through that cell, which gives
+    both the winner and the line scores of line_evaluation without
+    scanning the board.
+    """
+    def __init__(self, m=3, n=3, k=3, radius=2):
+        self.m = m
+        self.n = n
+        self.k = k
+        self.cells = bytearray(m * n)
+        self.to_move = X
+        self.moves = []
+        self.winner = EMPTY
+
+        # Windows as lists of cells, and the windows through each cell
+        self.windows = []
+        for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+            for i in range(m):
+                for j in range(n):
+                    end_i = i + di * (k - 1)
+                    end_j = j + dj * (k - 1)
+                    if 0 <= end_i < m and 0 <= end_j < n:
+                        self.windows.append([n * (i + di * step) + j + dj * step
+                                             for step in range(k)])
+        self.cell_windows = [[] for _ in range(m * n)]
+        for w, window in enumerate(self.windows):
+            for cell in window:
+                self.cell_windows[cell].append(w)
+        self.counts = {X: [0] * len(self.windows), O: [0] * len(self.windows)}
+
+        # A window holding only one player's marks is worth
+        # weights[marks] to them; mixed windows can no longer be won
+        self.weights = [0] + [10 ** count for count in range(k)]
+        self.scores = {X: 0, O: 0}
+
+        # Cells worth playing are the empty ones near a mark
+        self.nearby = []
+        for cell in range(m * n):
+            i, j = divmod(cell, n)
+            self.nearby.append([
+                n * r + c
+                for r in range(max(0, i - radius), min(m, i + radius + 1))
+                for c in range(max(0, j - radius), min(n, j + radius + 1))
+                if (r, c) != (i, j)
+            ])
+
+    @classmethod
+    def from_rows(cls, rows, k=None, radius=2):
+        """
+        Returns the board for a list-of-lists board like TicTacToe.board,
+        where cells other than "X" and "O" are empty. k defaults to the
+        shorter side, so a 3x3 board plays tic-tac-toe.
+        """
+        m = len(rows)
+        n = len(rows[0])
+        board = cls(m, n, k or min(m, n), radius)
+        marked = {"X": [], "O": []}
+        for i, row in enumerate(rows):
+            for j, cell in enumerate(row):
+                if cell in marked:
+                    marked[cell].append(n * i + j)
+        xs, o_cells = marked["X"], marked["O"]
+        if not len(o_cells) <= len(xs) <= len(o_cells) + 1:
+            raise ValueError("X moves first and players take turns")
+        # Replay the marks in turn so counts, scores and winner are set
+        for i in range(len(xs) + len(o_cells)):
+            board.make(xs[i // 2] if i % 2 == 0 else o_cells[i // 2])
+        return board
+
+    def to_rows(self):
+        return [[MARKS[self.cells[self.n * i + j]] for j in range(self.n)]
+                for i in range(self.m)]
+
+    def show(self):
+        for row in self.to_rows():
+            print(" ".join(row))
+
+    def make(self, cell):
+        """
+        Puts the mark of the player to move on cell and passes the turn.
+        """
+        if self.cells[cell] != EMPTY:
+            raise ValueError
+        player = self.to_move
+        other = O if player == X else X
+        mine = self.counts[player]
+        theirs = self.counts[other]
+        weights = self.weights
+        for w in self.cell_windows[cell]:
+            if theirs[w]:
+                # The window is lost to the opponent, if it was theirs
+                if not mine[w]:
+                    self.scores[other] -= weights[theirs[w]]
+            else:
+                self.scores[player] += weights[mine[w] + 1] - weights[mine[w]]
+            mine[w] += 1
+            if mine[w] == self.k:
+                self.winner = player
+        self.cells[cell] = player
+        self.moves.append(cell)
+        self.to_move = other
+
+    def unmake(self):
+        """
+        Takes back the last move made.
+        """
+        cell = self.moves.pop()
+        player = self.cells[cell]
+        other = O if player == X else X
+        mine = self.counts[player]
+        theirs = self.counts[other]
+        weights = self.weights
+        for w in self.cell_windows[cell]:
+            mine[w] -= 1
+            if theirs[w]:
+                if not mine[w]:
+                    self.scores[other] += weights[theirs[w]]
+            else:
+                self.scores[player] -= weights[mine[w] + 1] - weights[mine[w]]
+        self.cells[cell] = EMPTY
+        self.winner = EMPTY
+        self.to_move = player
+
+    def full(self):
+        return len(self.moves) == len(self.cells)
+
+    def terminal(self):
+        return bool(self.winner) or self.full()
+
+    def candidates(self):
+        """
+        Returns the empty cells within the radius of a mark, in order,
+        or the center cell on an empty board.
+        """
+        if not self.moves:
+            return [self.n * (self.m // 2) + self.n // 2]
+        cells = self.cells
+        found = set()
+        for move in self.moves:
+            for cell in self.nearby[move]:
+                if cells[cell] == EMPTY:
+                    found.add(cell)
+        return sorted(found)
+
+
+def line_evaluation(board):
+    """
+    Returns the score of the board for the player to move: the weights
+    of the windows they can still complete, minus the opponent's. Like
+    the sum heuristic of mytttsum.py, it adds up what each move leads to,
+    but counts marks per window instead of searching the outcomes.
+    """
+    other = O if board.to_move == X else X
+    return board.scores[board.to_move] - board.scores[other]
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class AlphaBeta:
+    """
+    Chooses moves by negamax alpha-beta search, deepening one ply at a
+    time until time_limit seconds have passed, max_depth is reached or
+    the outcome is proven. The best move of the last finished depth is
+    played.
+
+    evaluate(board) scores positions where the search stops, from the
+    point of view of the player to move. Moves that caused a cutoff are
+    tried first elsewhere: as killer moves at the same ply, and through
+    their history score at every ply.
+    """
+    def __init__(self, evaluate=line_evaluation, time_limit=1.0, max_depth=None, check_every=256):
+        self.evaluate = evaluate
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.check_every = check_every
+        self.history = {}
+        self.killers = []
+        self.nodes = 0
+        self.deadline = None
+
+    def choose(self, board):
+        """
+        Returns (cell, stats) with the move for the player to move and a
+        dict of the depth finished, its score, nodes searched and seconds.
+        """
+        started = time.perf_counter()
+        self.deadline = started + self.time_limit
+        self.nodes = 0
+        self.killers = []
+        # Age the history so older searches count for less
+        self.history = {cell: score // 2 for cell, score in self.history.items() if score > 1}
+
+        moves = board.candidates()
+        best_move = moves[0]
+        best_score = None
+        depth = 0
+        remaining = len(board.cells) - len(board.moves)
+        max_depth = remaining if self.max_depth is None else min(self.max_depth, remaining)
+        while depth < max_depth:
+            try:
+                move, score = self.search_root(board, depth + 1, best_move)
+            except SearchTimeout:
+                break
+            depth += 1
+            best_move, best_score = move, score
+            if abs(score) > WIN // 2:
+                break
+
+        stats = {
+            "depth": depth,
+            "score": best_score,
+            "nodes": self.nodes,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        return best_move, stats
+
+    def search_root(self, board, depth, previous):
+        best_move = None
+        alpha = -WIN - 1
+        for move in self.order(board.candidates(), 0, previous):
+            board.make(move)
+            try:
+                score = -self.search(board, depth - 1, -WIN - 1, -alpha, 1)
+            finally:
+                board.unmake()
+            if best_move is None or score > alpha:
+                alpha = score
+                best_move = move
+        return best_move, alpha
+
+    def search(self, board, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes % self.check_every == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+        # The player who just moved has won; sooner wins score higher
+        if board.winner:
+            return -(WIN - ply)
+        if board.full():
+            return 0
+        if depth == 0:
+            return self.evaluate(board)
+
+        best = -WIN - 1
+        for move in self.order(board.candidates(), ply):
+            board.make(move)
+            try:
+                score = -self.search(board, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake()
+            if score > best:
+                best = score
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self.remember(move, depth, ply)
+                break
+        return best
+
+    def order(self, moves, ply, first=None):
+        """
+        Returns moves in the order to search them: first, then the killer
+        moves of this ply, then by history score.
+        """
+        killers = self.killers[ply] if ply < len(self.killers) else []
+        history = self.history
+
+        def rank(move):
+            if move == first:
+                return (0, 0)
+            if move in killers:
+                return (1, killers.index(move))
+            return (2, -history.get(move, 0))
+        return sorted(moves, key=rank)
+
+    def remember(self, move, depth, ply):
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+
+def minimax(rows, time_limit=1.0, k=None):
+    """
+    Returns the action (i, j) for the current player on a list-of-lists
+    board, like morettt.minimax, or None once the game is over. k is the
+    number in a row that wins, by default the shorter side of the board.
+    """
+    board = MNKBoard.from_rows(rows, k)
+    if board.terminal():
+        return None
+    cell, _ = AlphaBeta(time_limit=time_limit).choose(board)
+    return divmod(cell, board.n)
+
+
+def play(board, engine, user=None):
+    """
+    Plays a game on board. The user, X or O, enters moves as row, col;
+    the engine plays the other side, or both sides if user is None.
+    """
+    while not board.terminal():
+        player = MARKS[board.to_move]
+        print(f"Player {player} turn")
+        board.show()
+        if player == user:
+            while True:
+                try:
+                    row, col = list(map(int, input("Enter row, col of your move: ").split()))
+                except ValueError:
+                    print(f"row, col must contain values between 1 and {board.m}, {board.n}")
+                    continue
+                if not (1 <= row <= board.m and 1 <= col <= board.n):
+                    print(f"row, col must be between 1 and {board.m}, {board.n}")
+                elif board.cells[board.n * (row - 1) + col - 1] != EMPTY:
+                    print("You must choose row, col of a blank '-' space")
+                else:
+                    break
+            board.make(board.n * (row - 1) + col - 1)
+        else:
+            cell, stats = engine.choose(board)
+            row, col = divmod(cell, board.n)
+            print(f"AI plays {row + 1} {col + 1} (depth {stats['depth']}, "
+                  f"{stats['nodes']} nodes, {stats['seconds']}s)")
+            board.make(cell)
+        print()
+
+    board.show()
+    if board.winner:
+        print(f"{MARKS[board.winner]} wins!")
+    else:
+        print("It's a draw!")
+
+
+def main():
+    args = sys.argv[1:]
+    aivsai = "--aivsai" in args
+    if aivsai:
+        args.remove("--aivsai")
+    if len(args) not in [0, 3, 4]:
+        sys.exit("Usage: python mnk.py [M N K [seconds]] [--aivsai]")
+    m, n, k = map(int, args[:3]) if args else (3, 3, 3)
+    seconds = float(args[3]) if len(args) == 4 else 1.0
+
+    board = MNKBoard(m, n, k)
+    engine = AlphaBeta(time_limit=seconds)
+    user = None
+    if not aivsai:
+        choice = input("Do you want to make the first move? (y/n):  ")
+        user = "X" if choice.lower() == "y" else "O"
+        print(f"You are player {user}")
+    play(board, engine, user)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,117 @@
-from myttt import TicTacToe
-
-def minimax(board):
-    """
-    Returns the optimal action for the current player on the board.
-    """
-    ttt = TicTacToe()
-    if ttt.terminal(board):
-        return None
-
-    # Optimization by hardcoding the first move
-    if board == [["-", "-", "-"], ["-", "-", "-"], ["-", "-", "-"]]:
-        return 0, 1
-
-    current_player = ttt.next_player(board)
-    best_value = float("-inf") if current_player == "X" else float("inf")
-
-    for move in ttt.actions(board):
-        new_value = minimax_value(ttt.result(board, move), best_value)
-
-        if current_player == "X":
-            new_value = max(best_value, new_value)
-
-        if current_player == "O":
-            new_value = min(best_value, new_value)
-
-        if new_value != best_value:
-            best_value = new_value
-            best_action = move
-
-    return best_action
-
-
-def minimax_value(board, best_value):
-    """
-    Returns the best value for each recursive minimax iteration.
-    Optimized using Alpha-Beta Pruning: If the new value found is better
-    than the best value then return without checking the others.
-    """
-    ttt = TicTacToe()
-    if ttt.terminal(board):
-        return ttt.utility(board)
-
-    current_player = ttt.next_player(board)
-    value = float("-inf") if current_player == "X" else float("inf")
-
-    for action in ttt.actions(board):
-        new_value = minimax_value(ttt.result(board, action), value)
-
-        if current_player == "X":
-            if new_value > best_value:
-                return new_value
-            value = max(value, new_value)
-
-        if current_player == "O":
-            if new_value < best_value:
-                return new_value
-            value = min(value, new_value)
-
-    return value
+from collections import OrderedDict
+
+from myttt import TicTacToe
+from symmetry import canonical, from_canonical, to_canonical
+
+
+class TranspositionTable:
+    """
+    Least recently used cache of solved positions, mapping a board
+    encoding to (value, best move). Holds at most capacity positions;
+    the whole 3x3 game has fewer than 6,000, so by default none are
+    evicted.
+    """
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.positions = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.positions)
+
+    def get(self, key):
+        entry = self.positions.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.positions.move_to_end(key)
+        return entry
+
+    def put(self, key, value, move):
+        self.positions[key] = (value, move)
+        self.positions.move_to_end(key)
+        while len(self.positions) > self.capacity:
+            self.positions.popitem(last=False)
+
+    def clear(self):
+        self.positions.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+table = TranspositionTable()
+
+
+def encode(board):
+    """
+    Returns the board as a 9 character string read row by row,
+    the same for every board with the same marks.
+    """
+    return "".join("".join(row) for row in board)
+
+
+def minimax(board, symmetric=True):
+    """
+    Returns the optimal action for the current player on the board.
+    """
+    ttt = TicTacToe()
+    if ttt.terminal(board):
+        return None
+    return solve(board, symmetric)[1]
+
+
+def minimax_value(board, symmetric=True):
+    """
+    Returns the minimax value of the board.
+    """
+    return solve(board, symmetric)[0]
+
+
+def solve(board, symmetric=True):
+    """
+    Returns (value, best move) for the board, with no move once the
+    game is over. Positions reached by different move orders are
+    searched once and then looked up in the transposition table.
+    Values are exact: a player only stops trying moves early after
+    finding a win, which no other move can beat.
+
+    If symmetric, the table is keyed on the canonical form of the board
+    so rotations and reflections of a position share one entry, and
+    the best move is stored for the canonical board and mapped back.
+    Either way the table maps a board string to a move on that board.
+    """
+    key = encode(board)
+    symmetry = 0
+    if symmetric:
+        key, symmetry = canonical(key)
+    entry = table.get(key)
+    if entry is not None:
+        value, move = entry
+        return value, move and from_canonical(move, symmetry)
+
+    ttt = TicTacToe()
+    if ttt.terminal(board):
+        value = ttt.utility(board)
+        table.put(key, value, None)
+        return value, None
+
+    current_player = ttt.next_player(board)
+    win = 1 if current_player == "X" else -1
+    best_value = None
+    best_action = None
+
+    for action in sorted(ttt.actions(board)):
+        new_value = solve(ttt.result(board, action), symmetric)[0]
+
+        if best_value is None \
+                or (current_player == "X" and new_value > best_value) \
+                or (current_player == "O" and new_value < best_value):
+            best_value = new_value
+            best_action = action
+            if best_value == win:
+                break
+
+    table.put(key, best_value, to_canonical(best_action, symmetry))
+    return best_value, best_action
@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 import copy
+import os
+import sys
+
 import morettt as mttt
+import solutions
 
 class TicTacToe:
-    def __init__(self):
+    def __init__(self, table=None):
         self.board = []
         self.user = None
         self.player = "X"
         self.ai_move = False
+        # A solutions.SolutionTable to answer AI moves from, if loaded
+        self.table = table
     def create_board(self):
         for i in range(3):
             row = []
@@ -118,6 +124,15 @@ class TicTacToe:
         new_board[move[0]][move[1]] = self.next_player(board)
         return new_board
 
+    def minimax(self, board):
+        """
+        Returns the optimal action for the current player on the board,
+        from the solution table when there is one.
+        """
+        if self.table is not None:
+            return self.table.minimax(board)
+        return mttt.minimax(board)
+
     def start(self):
         self.choose_player()
         self.create_board()
@@ -146,7 +161,7 @@ class TicTacToe:
             # Check for AI move
             if self.user != self.player and not self.terminal(self.board):
                 if self.ai_move:
-                    move = mttt.minimax(self.board)
+                    move = self.minimax(self.board)
                     self.board = self.result(self.board, move)
                     self.ai_move = False
                 else:
@@ -169,7 +184,10 @@ class TicTacToe:
 
 
 def main():
-    tic_tac_toe = TicTacToe()
+    if sys.argv[1:] not in [[], ["--table"]]:
+        sys.exit(f"Usage: python {os.path.basename(sys.argv[0])} [--table]")
+    table = solutions.load_table() if sys.argv[1:] == ["--table"] else None
+    tic_tac_toe = TicTacToe(table)
     tic_tac_toe.start()
 
 if __name__ == "__main__":
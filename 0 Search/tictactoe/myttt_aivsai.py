@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 import copy
+import os
+import sys
+
 import morettt_aivsai as mttt
+import solutions
 
 class TicTacToe:
-    def __init__(self):
+    def __init__(self, table=None):
         self.board = []
         self.user = None
         self.player = "X"
         self.ai_move = False
+        # A solutions.SolutionTable to answer AI moves from, if loaded
+        self.table = table
     def create_board(self):
         for i in range(3):
             row = []
@@ -105,6 +111,15 @@ class TicTacToe:
         new_board[move[0]][move[1]] = self.next_player(board)
         return new_board
 
+    def minimax(self, board):
+        """
+        Returns the optimal action for the current player on the board,
+        from the solution table when there is one.
+        """
+        if self.table is not None:
+            return self.table.minimax(board)
+        return mttt.minimax(board)
+
     def start(self):
         self.create_board()
         continue_game = True
@@ -113,7 +128,7 @@ class TicTacToe:
             if not self.terminal(self.board):
                 print(f"Player {self.player} turn")
                 self.show_board()
-                move = mttt.minimax(self.board)
+                move = self.minimax(self.board)
                 self.board = self.result(self.board, move)
             if self.terminal(self.board):
                 who = self.winner(self.board)
@@ -135,7 +150,10 @@ class TicTacToe:
 
 
 def main():
-    tic_tac_toe = TicTacToe()
+    if sys.argv[1:] not in [[], ["--table"]]:
+        sys.exit(f"Usage: python {os.path.basename(sys.argv[0])} [--table]")
+    table = solutions.load_table() if sys.argv[1:] == ["--table"] else None
+    tic_tac_toe = TicTacToe(table)
     tic_tac_toe.start()
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+The whole game solved once and stored as a table.
+
+Every board is numbered in base 3, cell (i, j) being digit 3 * i + j
+with 0 for empty, 1 for X and 2 for O, and the table holds one 16-bit
+entry for each of the 3 ** 9 numbers: bits 0 to 8 mark the best moves
+(bit 3 * i + j for move (i, j)), bits 9 and 10 hold the value plus 1,
+and bit 11 is set for boards reachable in a game. Boards are looked up
+by number, so answers take constant time, and loading is one read.
+"""
+import os
+import struct
+import sys
+from array import array
+
+TABLE_NAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solutions.bin")
+MAGIC = b"TTTSOL\0\0"
+PREFIX = struct.Struct("<8sI")
+VERSION = 1
+
+DIGITS = {"X": 1, "O": 2}
+REACHABLE = 1 << 11
+
+
+def board_number(board):
+    number = 0
+    weight = 1
+    for row in board:
+        for cell in row:
+            number += DIGITS.get(cell, 0) * weight
+            weight *= 3
+    return number
+
+
+class SolutionTable:
+    def __init__(self, entries):
+        self.entries = entries
+
+    def __len__(self):
+        """Returns the number of reachable boards in the table."""
+        return sum(1 for entry in self.entries if entry & REACHABLE)
+
+    def lookup(self, board):
+        """
+        Returns (value, best moves) for a board, with the moves sorted
+        and empty once the game is over. Raises KeyError for boards
+        that cannot come up in a game.
+        """
+        entry = self.entries[board_number(board)]
+        if not entry & REACHABLE:
+            raise KeyError("board not reachable")
+        moves = [divmod(cell, 3) for cell in range(9) if entry >> cell & 1]
+        return (entry >> 9 & 3) - 1, moves
+
+    def minimax(self, board):
+        """
+        Returns the optimal action for the current player on the board,
+        like morettt.minimax: the first of the best moves.
+        """
+        moves = self.lookup(board)[1]
+        return moves[0] if moves else None
+
+
+def build():
+    """
+    Solves every reachable board with morettt and returns the entries.
+    """
+    # Imported here so that loading a table does not load the search
+    import morettt
+    from myttt import TicTacToe
+
+    ttt = TicTacToe()
+    entries = array("H", [0]) * 3 ** 9
+    stack = [[["-", "-", "-"], ["-", "-", "-"], ["-", "-", "-"]]]
+    while stack:
+        board = stack.pop()
+        number = board_number(board)
+        if entries[number]:
+            continue
+
+        value = morettt.minimax_value(board)
+        moves = 0
+        if not ttt.terminal(board):
+            for move in ttt.actions(board):
+                child = ttt.result(board, move)
+                if morettt.minimax_value(child) == value:
+                    moves |= 1 << (3 * move[0] + move[1])
+                stack.append(child)
+        entries[number] = REACHABLE | (value + 1) << 9 | moves
+    return entries
+
+
+def write_table(entries, filename=TABLE_NAME):
+    entries = array("H", entries)
+    if sys.byteorder != "little":
+        entries.byteswap()
+    with open(filename, "wb") as f:
+        f.write(PREFIX.pack(MAGIC, VERSION))
+        f.write(entries.tobytes())
+
+
+def load_table(filename=TABLE_NAME):
+    """
+    Returns the SolutionTable stored in filename by write_table.
+    """
+    with open(filename, "rb") as f:
+        magic, version = PREFIX.unpack(f.read(PREFIX.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a tic-tac-toe solution table")
+        entries = array("H")
+        entries.frombytes(f.read())
+    if sys.byteorder != "little":
+        entries.byteswap()
+    if len(entries) != 3 ** 9:
+        raise ValueError("truncated tic-tac-toe solution table")
+    return SolutionTable(entries)
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python solutions.py [solutions.bin]")
+    filename = sys.argv[1] if len(sys.argv) == 2 else TABLE_NAME
+
+    entries = build()
+    write_table(entries, filename)
+    print(f"Solved {len(SolutionTable(entries))} positions, wrote {filename}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+The 8 symmetries of the 3x3 board: 4 rotations, each with and
+without a reflection. Boards are compared as 9 character strings
+read row by row, as made by morettt.encode.
+"""
+
+TRANSFORMS = [
+    lambda i, j: (i, j),            # identity
+    lambda i, j: (j, 2 - i),        # rotate 90 degrees clockwise
+    lambda i, j: (2 - i, 2 - j),    # rotate 180 degrees
+    lambda i, j: (2 - j, i),        # rotate 270 degrees clockwise
+    lambda i, j: (i, 2 - j),        # mirror left to right
+    lambda i, j: (2 - i, j),        # mirror top to bottom
+    lambda i, j: (j, i),            # mirror on the main diagonal
+    lambda i, j: (2 - j, 2 - i),    # mirror on the other diagonal
+]
+
+# SOURCES[s][k] is the cell of the original board that symmetry s
+# moves to cell k, both numbered 3 * i + j
+SOURCES = []
+for transform in TRANSFORMS:
+    sources = [0] * 9
+    for cell in range(9):
+        i, j = transform(*divmod(cell, 3))
+        sources[3 * i + j] = cell
+    SOURCES.append(sources)
+
+
+def transform(key, symmetry):
+    """
+    Returns the board string key with symmetry applied.
+    """
+    return "".join(key[cell] for cell in SOURCES[symmetry])
+
+
+def canonical(key):
+    """
+    Returns (canonical key, symmetry) where the canonical key is the
+    smallest of the 8 symmetric forms of the board string key, and
+    symmetry is the index in TRANSFORMS of the one that gives it.
+    """
+    return min((transform(key, symmetry), symmetry) for symmetry in range(8))
+
+
+def to_canonical(move, symmetry):
+    """
+    Returns where move (i, j) on the original board lands on the
+    canonical board.
+    """
+    return TRANSFORMS[symmetry](*move)
+
+
+def from_canonical(move, symmetry):
+    """
+    Maps move (i, j) on the canonical board back to the original board.
+    """
+    cell = SOURCES[symmetry][3 * move[0] + move[1]]
+    return divmod(cell, 3)